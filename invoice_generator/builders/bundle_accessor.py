@@ -16,12 +16,13 @@ but this class doesn't DO any styling - it just provides ACCESS to the config.
 Actual styling is delegated to the style_applier module.
 """
 import logging
+from functools import cached_property
 from typing import Any, Dict, Optional
 from openpyxl.worksheet.worksheet import Worksheet
 
 logger = logging.getLogger(__name__)
 
-from ..styling.models import StylingConfigModel
+from ..styling.models import StylingConfigModel, make_styling_config_model
 
 
 class BundleAccessor:
@@ -71,16 +72,17 @@ class BundleAccessor:
         """All sheet configurations from context config."""
         return self.context_config.get('all_sheet_configs', {})
     
-    @property
+    @cached_property
     def sheet_styling_config(self) -> Optional[StylingConfigModel]:
         """
         Styling configuration from style config.
         Automatically converts dict to StylingConfigModel if needed.
+        Converted once per builder; later reads are a plain attribute lookup.
         """
         styling_config = self.style_config.get('styling_config')
         if styling_config and not isinstance(styling_config, StylingConfigModel):
             try:
-                styling_config = StylingConfigModel(**styling_config)
+                styling_config = make_styling_config_model(styling_config)
             except Exception as e:
                 logger.warning(f"Could not create StylingConfigModel: {e}")
                 styling_config = None
@@ -103,10 +105,11 @@ class BundleAccessor:
         Args:
             footer_row: The row number to apply footer height to
         """
-        if not self.sheet_styling_config or not self.sheet_styling_config.rowHeights:
+        styling_config = self.sheet_styling_config
+        if not styling_config or not styling_config.rowHeights:
             return
         
-        row_heights_cfg = self.sheet_styling_config.rowHeights
+        row_heights_cfg = styling_config.rowHeights
         footer_height_config = row_heights_cfg.get("footer")
         match_header_height_flag = row_heights_cfg.get("footer_matches_header_height", True)
         
@@ -2,17 +2,17 @@ import logging
 from typing import Any, Dict, List, Optional, Tuple, Union
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.styles import Alignment, Border, Side, Font
-from openpyxl.utils import get_column_letter
 from openpyxl.cell.cell import MergedCell
+from openpyxl.styles.cell_style import StyleArray
 import traceback
 
 logger = logging.getLogger(__name__)
 
 from invoice_generator.data.data_preparer import prepare_data_rows, parse_mapping_rules
 from invoice_generator.utils.layout import apply_column_widths
+from invoice_generator.utils.formula_utils import column_letter
 from invoice_generator.styling.style_applier import apply_row_heights
-from invoice_generator.utils.layout import merge_contiguous_cells_by_id
-from invoice_generator.utils.merge_utils import merge_vertical_cells_in_range, apply_horizontal_merge_by_id
+from invoice_generator.utils.merge_utils import merge_vertical_cells_in_columns, apply_horizontal_merge_by_id, apply_merge_ranges
 # Legacy apply_cell_style removed - using only StyleRegistry + CellStyler
 from invoice_generator.styling.style_registry import StyleRegistry
 from invoice_generator.styling.cell_styler import CellStyler
@@ -64,7 +64,11 @@ class DataTableBuilderStyler:
         self.dynamic_desc_used = resolved_data.get('dynamic_desc_used', False)
         
         self.col_id_map = header_info.get('column_id_map', {})
-        self.idx_to_id_map = {v: k for k, v in self.col_id_map.items()}
+        # Reverse map is cached on header_info so the footer can reuse it
+        self.idx_to_id_map = header_info.get('_idx_to_id_map')
+        if self.idx_to_id_map is None:
+            self.idx_to_id_map = {v: k for k, v in self.col_id_map.items()}
+            header_info['_idx_to_id_map'] = self.idx_to_id_map
         self.column_colspan = header_info.get('column_colspan', {})  # Colspan for automatic merging
         
         # Initialize StyleRegistry and CellStyler for ID-driven styling
@@ -109,48 +113,85 @@ class DataTableBuilderStyler:
         data_start_row = data_writing_start_row
         data_end_row = data_start_row + actual_rows_to_process - 1 if actual_rows_to_process > 0 else data_start_row - 1
         
+        # Data row height is the same for every row: look it up once, not once per row
+        data_row_height = self.style_registry.get_row_height('data') if self.style_registry else None
+        
+        # Column sets are the same for every row: build them once, not once per row.
+        # valid_col_indices excludes columns filtered by skip_in_daf or skip_in_custom.
+        valid_col_indices = set(self.col_id_map.values())
+        cell_at = self.worksheet.cell
+        # Column index -> column id as a dense list: columns are few and contiguous, so a list
+        # index replaces a dict probe per cell
+        id_by_col_idx = [None] * (max(self.idx_to_id_map, default=0) + 1)
+        for col_idx, col_id in self.idx_to_id_map.items():
+            id_by_col_idx[col_idx] = col_id
+        # Registered style ids per column id: every data row of a column gets the same style, so the
+        # ids apply() set on the column's first cell are copied onto the rest instead of rebuilding
+        # Font/Alignment/Border objects per cell. Only the fields apply() sets are copied; protection
+        # and anything the style omits stay as they are on each cell.
+        data_style_ids: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        
+        # Header columns in sheet order; auto-number columns are filled in the same pass
+        ordered_col_indices = sorted(valid_col_indices)
+        # Probed once: without a StyleRegistry every cell would fall through the styling step
+        styling_active = bool(self.style_registry)
+        if not styling_active:
+            logger.error(f"❌ CRITICAL: StyleRegistry not initialized! Data rows {data_start_row}-{data_end_row} will have NO styling applied")
+            logger.error(f"   → Ensure config uses bundled format with 'columns' and 'row_contexts'")
+
         # --- Fill Data Rows Loop ---
         try:
             data_row_indices_written = []
             for i in range(actual_rows_to_process):
                 current_row_idx = data_start_row + i
                 data_row_indices_written.append(current_row_idx)
-                
                 row_data = self.data_rows[i]
                 
-                # Filter row_data to only include columns in the filtered column_id_map
-                # This removes columns that were filtered by skip_in_daf or skip_in_custom
-                valid_col_indices = set(self.col_id_map.values())
-                row_data = {col_idx: value for col_idx, value in row_data.items() if col_idx in valid_col_indices}
-                
-                # First, write columns that have data
-                columns_with_data = set(row_data.keys())
-
-                # Write all columns for this row (including static if present in row_data)
-                for col_idx, value in row_data.items():
-                    cell = self.worksheet.cell(row=current_row_idx, column=col_idx)
-                    if not isinstance(cell, MergedCell):
+                # Single traversal per row: write the value and style the cell while it is in hand.
+                # Columns missing from row_data are only written when they are auto-number columns.
+                for col_idx in ordered_col_indices:
+                    col_id = id_by_col_idx[col_idx]
+                    is_auto_number = col_idx not in row_data
+                    if is_auto_number and not (col_id and 'no' in col_id.lower()):
+                        continue
+                    cell = cell_at(current_row_idx, col_idx)
+                    if isinstance(cell, MergedCell):
+                        continue
+                    
+                    if is_auto_number:
+                        # Auto-number: row number starting from 1
+                        cell.value = i + 1
+                    else:
+                        value = row_data[col_idx]
                         # Check if value is a formula dict
                         if isinstance(value, dict) and value.get('type') == 'formula':
                             # Convert formula dict to Excel formula string
-                            formula_str = self._build_formula_string(value, current_row_idx)
-                            cell.value = formula_str
+                            cell.value = self._build_formula_string(value, current_row_idx)
                         else:
                             cell.value = value
-                        
-                        # Apply styling using StyleRegistry if available
-                        col_id = self.idx_to_id_map.get(col_idx)
-                        if not col_id:
-                            logger.error(f"❌ CRITICAL: Column index {col_idx} has NO column ID mapping!")
-                            logger.error(f"   Available mappings: {self.col_id_map}")
-                            logger.error(f"   This cell will have NO styling applied!")
-                            continue
-                        
-                        if not self.style_registry:
-                            logger.error(f"❌ CRITICAL: StyleRegistry not initialized! Cannot apply styling to cell {cell.coordinate}")
-                            logger.error(f"   → Ensure config uses bundled format with 'columns' and 'row_contexts'")
-                            continue
-                        
+                    
+                    # Apply styling using StyleRegistry if available
+                    if not col_id:
+                        logger.error(f"❌ CRITICAL: Column index {col_idx} has NO column ID mapping!")
+                        logger.error(f"   Available mappings: {self.col_id_map}")
+                        logger.error(f"   This cell will have NO styling applied!")
+                        continue
+                    
+                    if not styling_active:
+                        continue
+                    
+                    style_ids = data_style_ids.get(col_id)
+                    if style_ids is not None:
+                        # Relies on openpyxl internals: cell._style is the cell's StyleArray of
+                        # workbook style table ids. Only the fields applied_style_fields() reports
+                        # for this style are copied (kept in step with apply() by test_cell_styler).
+                        cell_style = cell._style
+                        if not cell_style:
+                            # Fresh cells have no StyleArray until a style is first set (as openpyxl's descriptors do)
+                            cell._style = cell_style = StyleArray()
+                        for field, style_id in style_ids:
+                            setattr(cell_style, field, style_id)
+                    else:
                         # Check if column is defined
                         if not self.style_registry.has_column(col_id):
                             logger.warning(f"❌ Column '{col_id}' not found in StyleRegistry! Available: {list(self.style_registry.columns.keys())}")
@@ -161,74 +202,52 @@ class DataTableBuilderStyler:
                         
                         # For col_static column, apply side borders only (no top/bottom)
                         if col_id == 'col_static':
-                            from copy import deepcopy
-                            style = deepcopy(style)
-                            # Apply side borders only
-                            style['border_style'] = 'sides_only'
+                            style = {**style, 'border_style': 'sides_only'}
                         
                         self.cell_styler.apply(cell, style)
-                        
-                        # Apply row height ONCE per row (only on first column processed)
-                        if current_row_idx not in self._rows_with_height_applied:
-                            row_height = self.style_registry.get_row_height('data')
-                            if row_height:
-                                self.cell_styler.apply_row_height(self.worksheet, current_row_idx, row_height)
-                                logger.debug(f"Applied row height {row_height} to row {current_row_idx}")
-                            self._rows_with_height_applied.add(current_row_idx)
-                
-                # Handle columns defined in header but missing from row_data (auto-number columns)
-                all_column_indices = set(self.col_id_map.values())
-                missing_columns = all_column_indices - columns_with_data
-                
-                for col_idx in missing_columns:
-                    col_id = self.idx_to_id_map.get(col_idx)
-                    if col_id and 'no' in col_id.lower():  # Auto-number columns like 'col_no'
-                        cell = self.worksheet.cell(row=current_row_idx, column=col_idx)
-                        if not isinstance(cell, MergedCell):
-                            # Auto-number: row number starting from 1
-                            cell.value = i + 1
-                            
-                            # Apply styling
-                            if not self.style_registry:
-                                logger.error(f"❌ CRITICAL: StyleRegistry not initialized for auto-number column {col_id}")
-                                continue
-                            
-                            style = self.style_registry.get_style(col_id, context='data')
-                            self.cell_styler.apply(cell, style)
+                        cell_style = cell._style
+                        data_style_ids[col_id] = tuple(
+                            (field, getattr(cell_style, field)) for field in self.cell_styler.applied_style_fields(style)
+                        )
+
+            # Apply the data row height in one pass once all rows are written, not per cell
+            pending_height_rows = [r for r in data_row_indices_written if r not in self._rows_with_height_applied]
+            if data_row_height:
+                self.cell_styler.apply_row_heights(self.worksheet, pending_height_rows, data_row_height)
+                logger.debug("Applied row height %s to %d data rows", data_row_height, len(pending_height_rows))
+            self._rows_with_height_applied.update(pending_height_rows)
 
             # --- Apply Horizontal Merges (based on colspan from header structure) ---
             if self.column_colspan:
+                pending_merges = []
                 for row_idx in range(data_start_row, data_end_row + 1):
                     for col_id, colspan in self.column_colspan.items():
                         if colspan > 1:  # Only merge if colspan > 1
                             col_idx = self.col_id_map.get(col_id)
                             if col_idx:
                                 # Merge from col_idx to col_idx + colspan - 1
-                                start_col = col_idx
-                                end_col = col_idx + colspan - 1
-                                self.worksheet.merge_cells(
-                                    start_row=row_idx,
-                                    start_column=start_col,
-                                    end_row=row_idx,
-                                    end_column=end_col
-                                )
-                                logger.debug(f"Merged data row {row_idx}, columns {start_col}-{end_col} for {col_id} (colspan={colspan})")
+                                pending_merges.append((row_idx, col_idx, row_idx, col_idx + colspan - 1))
+                merged_count = apply_merge_ranges(self.worksheet, pending_merges)
+                logger.debug(f"Merged {merged_count} colspan ranges in data rows {data_start_row}-{data_end_row}")
 
             # --- Apply Vertical Merges ---
             if self.vertical_merge_columns and actual_rows_to_process > 0:
                 logger.debug(f"Applying vertical merges to columns: {self.vertical_merge_columns}")
+                scan_cols = []
                 for col_id in self.vertical_merge_columns:
                     col_idx = self.col_id_map.get(col_id)
                     if col_idx:
-                        logger.debug(f"  Merging contiguous cells in column '{col_id}' (index {col_idx}) from row {data_start_row} to {data_end_row}")
-                        merge_vertical_cells_in_range(
-                            worksheet=self.worksheet,
-                            scan_col=col_idx,
-                            start_row=data_start_row,
-                            end_row=data_end_row
-                        )
+                        scan_cols.append(col_idx)
                     else:
                         logger.warning(f"warning!!  Vertical merge requested for column '{col_id}' but column not found in column_id_map")
+                if scan_cols:
+                    # One row scan covers every requested column
+                    merge_vertical_cells_in_columns(
+                        worksheet=self.worksheet,
+                        scan_cols=scan_cols,
+                        start_row=data_start_row,
+                        end_row=data_end_row
+                    )
 
         except Exception as fill_data_err:
             logger.error(f"Error during data filling loop: {fill_data_err}\n{traceback.format_exc()}")
@@ -258,7 +277,7 @@ class DataTableBuilderStyler:
         for i, input_id in enumerate(inputs):
             col_idx = self.col_id_map.get(input_id)
             if col_idx:
-                col_letter = get_column_letter(col_idx)
+                col_letter = column_letter(col_idx)
                 formula = formula.replace(f'{{col_ref_{i}}}', col_letter)
         
         # Replace {row} with actual row number
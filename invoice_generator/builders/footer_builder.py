@@ -1,18 +1,19 @@
 import logging
-import traceback
 from copy import deepcopy
 from decimal import Decimal, InvalidOperation
 from typing import Any, Dict, List, Optional, Tuple
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.styles import Alignment, Font, Side, Border
-from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
 from ..styling.models import StylingConfigModel, FooterData
+from ..utils.formula_utils import column_letter
 # Legacy apply_cell_style removed - using only StyleRegistry + CellStyler
 from ..styling.style_registry import StyleRegistry
 from ..styling.cell_styler import CellStyler
+from ..styling.style_config import FORMAT_NUMBER_COMMA_SEPARATED2
+from ..utils.merge_utils import apply_merge_ranges
 from .bundle_accessor import BundleAccessor
 
 class FooterBuilder(BundleAccessor):
@@ -134,7 +135,36 @@ class FooterBuilder(BundleAccessor):
         """Dynamic description used flag from context config."""
         return self.context_config.get('dynamic_desc_used', False)
 
-    def _apply_footer_cell_style(self, cell, col_id, row_context='footer', apply_border=True):
+    @property
+    def idx_to_id_map(self) -> Dict[int, str]:
+        """Reverse column map (index -> column ID), built once and cached on header_info."""
+        header_info = self.header_info
+        idx_to_id_map = header_info.get('_idx_to_id_map')
+        if idx_to_id_map is None:
+            idx_to_id_map = {v: k for k, v in header_info.get('column_id_map', {}).items()}
+            header_info['_idx_to_id_map'] = idx_to_id_map
+        return idx_to_id_map
+
+    @property
+    def colspan_merge_spans(self) -> List[Tuple[int, int]]:
+        """
+        (start_col, end_col) for every header column with colspan > 1.
+        Resolved and validated once, then cached on header_info like idx_to_id_map,
+        so each footer row only has to turn them into merge ranges.
+        """
+        header_info = self.header_info
+        spans = header_info.get('_colspan_merge_spans')
+        if spans is None:
+            column_map_by_id = header_info.get('column_id_map', {})
+            spans = []
+            for col_id, colspan in header_info.get('column_colspan', {}).items():
+                col_idx = column_map_by_id.get(col_id)
+                if isinstance(colspan, int) and colspan > 1 and col_idx:
+                    spans.append((col_idx, col_idx + colspan - 1))
+            header_info['_colspan_merge_spans'] = spans
+        return spans
+
+    def _apply_footer_cell_style(self, cell, col_id, row_context='footer', apply_border=True, style_overrides: Optional[Dict[str, Any]] = None):
         """
         Apply footer cell style to a single cell using StyleRegistry (strict - no legacy fallback).
         
@@ -143,19 +173,19 @@ class FooterBuilder(BundleAccessor):
             col_id: The column ID for this cell
             row_context: The row context to use (default 'footer', can be 'before_footer')
             apply_border: Whether to apply borders (default True, set False for grand_total)
+            style_overrides: Optional style properties (e.g. 'format') that replace the registry values
         """
         if not self.style_registry or not col_id:
             logger.error(f"❌ CRITICAL: StyleRegistry not initialized or no col_id for footer cell {cell.coordinate}")
             logger.error(f"   → Ensure config uses bundled format with 'columns' and 'row_contexts'")
             return
         
-        # Use specified context for row styling
-        style = self.style_registry.get_style(col_id, context=row_context)
-        
         # Remove borders if requested (for grand_total footers)
         if not apply_border:
-            style = deepcopy(style)
-            style['border_style'] = None
+            style_overrides = {**(style_overrides or {}), 'border_style': None}
+        
+        # Use specified context for row styling
+        style = self.style_registry.get_style(col_id, context=row_context, overrides=style_overrides)
         
         self.cell_styler.apply(cell, style)
         logger.debug(f"Applied StyleRegistry style to {row_context} cell {col_id} (borders={'yes' if apply_border else 'no'})")
@@ -169,6 +199,18 @@ class FooterBuilder(BundleAccessor):
                 logger.debug(f"Applied {row_context} row height {row_height} to row {row_num}")
             self._rows_with_height_applied.add(row_num)
 
+    def _styled_columns(self, num_columns: int) -> List[Tuple[int, str]]:
+        """
+        (column index, col_id) pairs for the full-row styling passes, in column order.
+        
+        Only columns with a col_id within num_columns are returned (colspan-covered
+        columns are never styled). Empty when there is no StyleRegistry, so the
+        passes are skipped entirely instead of visiting every column.
+        """
+        if not self.style_registry:
+            return []
+        return sorted((c_idx, col_id) for c_idx, col_id in self.idx_to_id_map.items() if c_idx <= num_columns)
+
     def _apply_footer_row_height(self, row_num: int, context: str = 'footer'):
         """
         Apply row height to a specific row using StyleRegistry.
@@ -207,15 +249,14 @@ class FooterBuilder(BundleAccessor):
         if isinstance(col_id, int):
             return col_id + 1
         
-        # Handle string column IDs
+        # Handle string column IDs - numeric strings are raw indices, anything else is looked up
+        # (checked up front so IDs like 'col_desc' don't go through a failed int() parse)
         if isinstance(col_id, str):
-            try:
-                # Try to parse as integer
-                raw_index = int(col_id)
-                return raw_index + 1
-            except ValueError:
-                # Look up in column map
-                return column_map_by_id.get(col_id)
+            stripped = col_id.strip()
+            digits = stripped[1:] if stripped[:1] in ('+', '-') else stripped
+            if digits.isdecimal():
+                return int(stripped) + 1
+            return column_map_by_id.get(col_id)
         
         return None
 
@@ -232,6 +273,12 @@ class FooterBuilder(BundleAccessor):
                 logger.error(f"   footer_config content: {self.footer_config}")
             return -1
 
+        # Footers are written, merged and styled by random cell access after the data rows,
+        # which openpyxl's streaming write-only worksheets do not support.
+        if getattr(self.worksheet.parent, 'write_only', False):
+            logger.error(f"[FooterBuilder] Cannot build footer on write-only worksheet '{self.worksheet.title}'")
+            return -1
+
         try:
             current_footer_row = self.footer_row_num
             initial_row = current_footer_row
@@ -279,8 +326,8 @@ class FooterBuilder(BundleAccessor):
                     logger.warning(f"Unknown footer type '{footer_type}', using regular footer")
                     self._build_regular_footer(current_footer_row)
             except Exception as footer_build_err:
+                # Traceback is logged once by the outer handler
                 logger.error(f"❌ [FooterBuilder] Error building {footer_type} footer at row {current_footer_row}: {footer_build_err}")
-                logger.error(traceback.format_exc())
                 raise
 
             # Apply row height to the footer row
@@ -303,8 +350,7 @@ class FooterBuilder(BundleAccessor):
             return current_footer_row
 
         except Exception as e:
-            logger.error(f"[FooterBuilder] FATAL ERROR during footer generation starting at row {self.footer_row_num}: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception(f"[FooterBuilder] FATAL ERROR during footer generation starting at row {self.footer_row_num}: {e}")
             return -1
 
     def _build_regular_footer(self, current_footer_row: int):
@@ -397,46 +443,25 @@ class FooterBuilder(BundleAccessor):
         self._apply_footer_cell_style(cell, column_id, row_context='footer')
         
         # Apply automatic horizontal merges based on header colspan (NEW - same as main footer)
-        column_colspan = self.header_info.get('column_colspan', {})
-        if column_colspan:
-            for col_id, colspan in column_colspan.items():
-                if colspan > 1:  # Only merge if colspan > 1
-                    c_idx = column_map_by_id.get(col_id)
-                    if c_idx:
-                        end_col = c_idx + colspan - 1
-                        self.worksheet.merge_cells(
-                            start_row=row,
-                            start_column=c_idx,
-                            end_row=row,
-                            end_column=end_col
-                        )
-                        logger.debug(f"Auto-merged before_footer row {row}, columns {c_idx}-{end_col} for {col_id} (colspan={colspan})")
+        # Spans are pre-validated, so the batch below needs no error handling
+        pending_merges = [(row, start_col, row, end_col) for start_col, end_col in self.colspan_merge_spans]
         
         # Apply merge if specified (manual merge from config)
-        if merge_span > 0:
+        if isinstance(merge_span, int) and merge_span > 0:
             # merge_span is the TOTAL number of columns to span (including current cell)
             # So if merge_span=2, we merge current column + 1 more column
             end_col = col_idx + (merge_span - 1)
-            merge_range = f"{get_column_letter(col_idx)}{row}:{get_column_letter(end_col)}{row}"
-            try:
-                self.worksheet.merge_cells(merge_range)
-                logger.debug(f"[FooterBuilder._build_before_footer] Merged cells: {merge_range} (spanning {merge_span} columns)")
-            except Exception as e:
-                logger.warning(f"Could not merge cells {merge_range}: {e}")
+            pending_merges.append((row, col_idx, row, end_col))
+            logger.debug(f"[FooterBuilder._build_before_footer] Merged cells: columns {col_idx}-{end_col} on row {row} (spanning {merge_span} columns)")
+        
+        apply_merge_ranges(self.worksheet, pending_merges)
         
         # Apply styling and borders to all cells in the row using footer row context
         # Special case: col_static (column 1) gets only side borders (left/right), no top/bottom
         # Note: For grand_total footers, no borders are applied to before_footer rows
         
-        idx_to_id_map = {v: k for k, v in column_map_by_id.items()}
-        for c_idx in range(1, num_columns + 1):
+        for c_idx, col_id in self._styled_columns(num_columns):
             cell = self.worksheet.cell(row=row, column=c_idx)
-            col_id = idx_to_id_map.get(c_idx)
-            
-            # Skip cells without col_id (they're part of a colspan merge)
-            if not col_id:
-                logger.debug(f"[FooterBuilder._build_before_footer] Skipping {cell.coordinate} - no col_id (part of merge)")
-                continue
             
             # Skip border application for grand_total footers
             if footer_type == "grand_total":
@@ -487,21 +512,23 @@ class FooterBuilder(BundleAccessor):
         
         logger.debug(f"[FooterBuilder._build_footer_common] num_columns={num_columns}, column_map has {len(column_map_by_id)} entries")
 
+        apply_border = footer_type != "grand_total"
+        # Column index -> col_id used for styling, so the row pass below can skip cells already styled
+        styled_with = {}
+
         # Write total text
         total_text = self.override_total_text if self.override_total_text is not None else default_total_text
         total_text_col_id = self.footer_config.get("total_text_column_id")
         total_text_col_idx = self._resolve_column_index(total_text_col_id, column_map_by_id)
         
-        logger.info(f"[FooterBuilder._build_footer_common] TOTAL TEXT DEBUG:")
-        logger.info(f"   total_text='{total_text}'")
-        logger.info(f"   total_text_col_id='{total_text_col_id}'")
-        logger.info(f"   total_text_col_idx={total_text_col_idx}")
-        logger.info(f"   column_map_by_id={column_map_by_id}")
+        logger.debug("[FooterBuilder._build_footer_common] total_text=%r, total_text_col_id=%r, total_text_col_idx=%s, column_map_by_id=%s",
+                     total_text, total_text_col_id, total_text_col_idx, column_map_by_id)
         
         if total_text_col_idx:
             cell = self.worksheet.cell(row=current_footer_row, column=total_text_col_idx, value=total_text)
-            self._apply_footer_cell_style(cell, total_text_col_id, apply_border=(footer_type != "grand_total"))
-            logger.info(f"[FooterBuilder._build_footer_common] WROTE TOTAL TEXT to {cell.coordinate} value='{cell.value}'")
+            self._apply_footer_cell_style(cell, total_text_col_id, apply_border=apply_border)
+            styled_with[total_text_col_idx] = total_text_col_id
+            logger.debug("[FooterBuilder._build_footer_common] Wrote total text to %s value=%r", cell.coordinate, cell.value)
         else:
             logger.error(f"[FooterBuilder._build_footer_common] MISSING total_text_column_id in footer config!")
             logger.error(f"   footer_config keys: {list(self.footer_config.keys())}")
@@ -517,57 +544,45 @@ class FooterBuilder(BundleAccessor):
         if pallet_col_idx and self.pallet_count > 0:
             pallet_text = f"{self.pallet_count} PALLET{'S' if self.pallet_count != 1 else ''}"
             cell = self.worksheet.cell(row=current_footer_row, column=pallet_col_idx, value=pallet_text)
-            self._apply_footer_cell_style(cell, pallet_col_id, apply_border=(footer_type != "grand_total"))
+            self._apply_footer_cell_style(cell, pallet_col_id, apply_border=apply_border)
+            styled_with[pallet_col_idx] = pallet_col_id
             logger.debug(f"[FooterBuilder._build_footer_common] Wrote pallet text to {cell.coordinate}")
 
         # Write sum formulas
         sum_column_ids = self.footer_config.get("sum_column_ids", [])
-        logger.debug(f"[FooterBuilder._build_footer_common] Sum columns: {sum_column_ids}, sum_ranges: {self.sum_ranges}")
+        logger.debug("[FooterBuilder._build_footer_common] Sum columns: %s, sum_ranges: %s", sum_column_ids, self.sum_ranges)
         
         if self.sum_ranges:
+            # Row bounds are the same for every sum column; stringify them once
+            range_bounds = [(str(start), str(end)) for start, end in self.sum_ranges]
             for col_id in sum_column_ids:
                 col_idx = column_map_by_id.get(col_id)
                 if col_idx:
-                    col_letter = get_column_letter(col_idx)
-                    sum_parts = [f"{col_letter}{start}:{col_letter}{end}" for start, end in self.sum_ranges]
-                    formula = f"=SUM({','.join(sum_parts)})"
+                    col_letter = column_letter(col_idx)
+                    formula = "=SUM(" + ",".join(col_letter + start + ":" + col_letter + end for start, end in range_bounds) + ")"
                     cell = self.worksheet.cell(row=current_footer_row, column=col_idx, value=formula)
-                    self._apply_footer_cell_style(cell, col_id, apply_border=(footer_type != "grand_total"))
-                    logger.debug(f"[FooterBuilder._build_footer_common] Wrote formula to {cell.coordinate}: {formula}")
+                    self._apply_footer_cell_style(cell, col_id, apply_border=apply_border)
+                    styled_with[col_idx] = col_id
+                    logger.debug("[FooterBuilder._build_footer_common] Wrote formula to %s: %s", cell.coordinate, formula)
         
-        # Apply styling to all footer cells
+        # Apply styling to the remaining footer cells (borders across the whole row)
         # For grand_total footers, skip borders
-        idx_to_id_map = {v: k for k, v in column_map_by_id.items()}
+        # Columns without col_id are part of a colspan merge and are never touched
         cells_styled = 0
-        for c_idx in range(1, num_columns + 1):
-            cell = self.worksheet.cell(row=current_footer_row, column=c_idx)
-            col_id = idx_to_id_map.get(c_idx)
-            
-            # Skip cells without col_id (they're part of a colspan merge)
-            if not col_id:
-                logger.debug(f"[FooterBuilder._build_footer_common] Skipping {cell.coordinate} - no col_id (part of merge)")
+        for c_idx, col_id in self._styled_columns(num_columns):
+            if styled_with.get(c_idx) == col_id:
                 continue
-                
-            self._apply_footer_cell_style(cell, col_id, apply_border=(footer_type != "grand_total"))
+            
+            cell = self.worksheet.cell(row=current_footer_row, column=c_idx)
+            self._apply_footer_cell_style(cell, col_id, apply_border=apply_border)
             cells_styled += 1
         
         logger.debug(f"[FooterBuilder._build_footer_common] Applied styling to {cells_styled} cells")
 
         # Apply automatic horizontal merges based on header colspan
-        column_colspan = self.header_info.get('column_colspan', {})
-        if column_colspan:
-            for col_id, colspan in column_colspan.items():
-                if colspan > 1:  # Only merge if colspan > 1
-                    col_idx = column_map_by_id.get(col_id)
-                    if col_idx:
-                        end_col = col_idx + colspan - 1
-                        self.worksheet.merge_cells(
-                            start_row=current_footer_row,
-                            start_column=col_idx,
-                            end_row=current_footer_row,
-                            end_column=end_col
-                        )
-                        logger.debug(f"Auto-merged footer row {current_footer_row}, columns {col_idx}-{end_col} for {col_id} (colspan={colspan})")
+        # Merges are collected and applied in one batch
+        pending_merges = [(current_footer_row, start_col, current_footer_row, end_col)
+                          for start_col, end_col in self.colspan_merge_spans]
 
         # Apply manual merge rules (from config)
         merge_rules = self.footer_config.get("merge_rules", [])
@@ -576,9 +591,11 @@ class FooterBuilder(BundleAccessor):
             colspan = rule.get("colspan")
             resolved_start_col = self._resolve_column_index(start_column_id, column_map_by_id)
             
-            if resolved_start_col and colspan:
+            if resolved_start_col and isinstance(colspan, int) and colspan > 0:
                 end_col = min(resolved_start_col + colspan - 1, num_columns)
-                self.worksheet.merge_cells(start_row=current_footer_row, start_column=resolved_start_col, end_row=current_footer_row, end_column=end_col)
+                pending_merges.append((current_footer_row, resolved_start_col, current_footer_row, end_col))
+
+        apply_merge_ranges(self.worksheet, pending_merges)
 
     def _build_leather_summary_add_on(self, current_footer_row: int, leather_config: Dict[str, Any] = None) -> int:
         """
@@ -616,6 +633,7 @@ class FooterBuilder(BundleAccessor):
                  total_text_col_idx = column_id_map.get("col_desc", 2)
 
             current_row = current_footer_row
+            idx_to_id_map = self.idx_to_id_map
             
             # Helper function to apply styling without borders
             def apply_summary_style(cell, col_id):
@@ -658,25 +676,28 @@ class FooterBuilder(BundleAccessor):
                     logger.debug(f"Skipping {leather_type} summary row - no content")
                     continue
 
+                # Column index -> col_id used for styling, so the row pass below skips them
+                styled_with = {}
+
                 # Write Label to total_text_column_id
                 total_text = self.footer_config.get("total_text", "TOTAL OF:")
                 cell = self.worksheet.cell(row=current_row, column=total_text_col_idx)
                 cell.value = total_text
                 apply_summary_style(cell, total_text_col_id)
+                styled_with[total_text_col_idx] = total_text_col_id
                 
                 # Write Leather Type to the NEXT column
                 type_text = "LEATHER" if leather_type == 'COW' else f"{leather_type} LEATHER"
                 
                 # Find the ID of the next column to apply correct styling
                 next_col_idx = total_text_col_idx + 1
-                # We need idx_to_id_map to find the ID
-                idx_to_id_map = {v: k for k, v in column_id_map.items()}
                 next_col_id = idx_to_id_map.get(next_col_idx)
                 
                 if next_col_id:
                     type_cell = self.worksheet.cell(row=current_row, column=next_col_idx)
                     type_cell.value = type_text
                     apply_summary_style(type_cell, next_col_id)
+                    styled_with[next_col_idx] = next_col_id
                 
                 # Write pallet count to pallet_count_column_id (like regular footer)
                 pallet_col_id = self.footer_config.get("pallet_count_column_id")
@@ -687,6 +708,7 @@ class FooterBuilder(BundleAccessor):
                     pallet_cell = self.worksheet.cell(row=current_row, column=pallet_col_idx)
                     pallet_cell.value = pallet_text
                     apply_summary_style(pallet_cell, pallet_col_id)
+                    styled_with[pallet_col_idx] = pallet_col_id
                     logger.debug(f"Wrote {leather_type} pallet count '{pallet_text}' to {pallet_cell.coordinate}")
                 
                 # Write sum totals to sum_column_ids (like regular footer)
@@ -698,22 +720,19 @@ class FooterBuilder(BundleAccessor):
                             val_cell = self.worksheet.cell(row=current_row, column=col_idx)
                             val_cell.value = value
                             apply_summary_style(val_cell, col_id)
+                            styled_with[col_idx] = col_id
                             logger.debug(f"Wrote {leather_type} {col_id} = {value} to {val_cell.coordinate}")
                 
-                # Apply styling to ALL columns to ensure consistent appearance (including pallet column)
+                # Apply styling to the remaining columns to ensure consistent appearance (including pallet column)
+                # Columns without col_id are part of a colspan merge and are never touched
                 num_columns = self.header_info.get('num_columns', 1)
-                idx_to_id_map = {v: k for k, v in column_id_map.items()}
                 
-                for c_idx in range(1, num_columns + 1):
-                    cell = self.worksheet.cell(row=current_row, column=c_idx)
-                    col_id = idx_to_id_map.get(c_idx)
-                    
-                    # Skip cells without col_id (they're part of a colspan merge)
-                    if not col_id:
-                        logger.debug(f"Skipping {cell.coordinate} - no col_id (part of merge)")
+                for c_idx, col_id in self._styled_columns(num_columns):
+                    if styled_with.get(c_idx) == col_id:
                         continue
                     
                     # Apply styling to all cells (even empty ones like pallet column)
+                    cell = self.worksheet.cell(row=current_row, column=c_idx)
                     apply_summary_style(cell, col_id)
                 
                 # Apply row height to the summary row
@@ -782,7 +801,6 @@ class FooterBuilder(BundleAccessor):
         # Get column info for applying styles to all cells
         col_id_map = self.header_info.get("column_id_map", {})
         num_columns = self.header_info.get('num_columns', 1)
-        idx_to_id_map = {v: k for k, v in col_id_map.items()}
         
         # Write N.W row
         net_weight_row = current_footer_row
@@ -792,19 +810,18 @@ class FooterBuilder(BundleAccessor):
         # Apply footer styling to label and value cells
         label_col_id = weight_config.get("label_col_id")
         value_col_id = weight_config.get("value_col_id")
+        # Weight values always use a fixed number format, applied with the rest of the style
+        weight_format = {'format': FORMAT_NUMBER_COMMA_SEPARATED2}
         self._apply_footer_cell_style(cell_net_label, label_col_id, row_context='footer')
-        self._apply_footer_cell_style(cell_net_value, value_col_id, row_context='footer')
-        
-        # Override number format for weight values (hardcoded)
-        cell_net_value.number_format = '#,##0.00'
+        self._apply_footer_cell_style(cell_net_value, value_col_id, row_context='footer', style_overrides=weight_format)
+        # Set directly as well: the style call is a no-op without a StyleRegistry
+        cell_net_value.number_format = FORMAT_NUMBER_COMMA_SEPARATED2
         
         # Apply borders to all other cells in N.W row
-        for c_idx in range(1, num_columns + 1):
-            if c_idx not in [label_col_idx, value_col_idx]:
+        for c_idx, col_id in self._styled_columns(num_columns):
+            if c_idx != label_col_idx and c_idx != value_col_idx:
                 cell = self.worksheet.cell(row=net_weight_row, column=c_idx)
-                col_id = idx_to_id_map.get(c_idx)
-                if col_id:
-                    self._apply_footer_cell_style(cell, col_id, row_context='footer')
+                self._apply_footer_cell_style(cell, col_id, row_context='footer')
         
         self._apply_footer_row_height(net_weight_row)
         
@@ -814,16 +831,14 @@ class FooterBuilder(BundleAccessor):
         cell_gross_value = self.worksheet.cell(row=gross_weight_row, column=value_col_idx, value=float(grand_total_gross))
         
         self._apply_footer_cell_style(cell_gross_label, label_col_id, row_context='footer')
-        self._apply_footer_cell_style(cell_gross_value, value_col_id, row_context='footer')
-        cell_gross_value.number_format = '#,##0.00'
+        self._apply_footer_cell_style(cell_gross_value, value_col_id, row_context='footer', style_overrides=weight_format)
+        cell_gross_value.number_format = FORMAT_NUMBER_COMMA_SEPARATED2
         
         # Apply borders to all other cells in G.W row
-        for c_idx in range(1, num_columns + 1):
-            if c_idx not in [label_col_idx, value_col_idx]:
+        for c_idx, col_id in self._styled_columns(num_columns):
+            if c_idx != label_col_idx and c_idx != value_col_idx:
                 cell = self.worksheet.cell(row=gross_weight_row, column=c_idx)
-                col_id = idx_to_id_map.get(c_idx)
-                if col_id:
-                    self._apply_footer_cell_style(cell, col_id, row_context='footer')
+                self._apply_footer_cell_style(cell, col_id, row_context='footer')
         
         self._apply_footer_row_height(gross_weight_row)
         
@@ -1,6 +1,7 @@
 import logging
 from typing import Any, Dict, List, Optional
 from openpyxl.worksheet.worksheet import Worksheet
+from openpyxl.cell.cell import MergedCell
 
 logger = logging.getLogger(__name__)
 
@@ -8,8 +9,8 @@ from ..styling.models import StylingConfigModel
 from ..styling.style_applier import apply_header_style  # apply_cell_style removed - using StyleRegistry only
 from ..styling.style_registry import StyleRegistry
 from ..styling.cell_styler import CellStyler
-from ..utils.layout import calculate_header_dimensions
-from openpyxl.utils import get_column_letter
+from ..utils.merge_utils import apply_merge_ranges
+from ..utils.formula_utils import column_letter
 
 class HeaderBuilderStyler:
     def __init__(
@@ -71,14 +72,13 @@ class HeaderBuilderStyler:
         if not self.header_layout_config or self.start_row <= 0:
             return None
 
-        num_header_rows, num_header_cols = calculate_header_dimensions(self.header_layout_config)
-
         first_row_index = self.start_row
         last_row_index = self.start_row
         max_col = 0
         column_map = {}
         column_id_map = {}
         column_colspan = {}  # Track colspan for each column ID (excluding parents with children)
+        pending_merges = []
         
         # Identify parent columns (those with children) - they should NOT be in column_colspan
         parent_column_ids = set()
@@ -87,6 +87,10 @@ class HeaderBuilderStyler:
                 if 'children' in col and col['children']:
                     parent_column_ids.add(col.get('id'))
 
+        cell_at = self.worksheet.cell
+        # Header row height is the same for every header row: look it up once
+        header_row_height = self.style_registry.get_row_height('header') if self.style_registry else None
+
         for cell_config in self.header_layout_config:
             row_offset = cell_config.get('row', 0)
             col_offset = cell_config.get('col', 0)
@@ -102,14 +106,13 @@ class HeaderBuilderStyler:
             max_col = max(max_col, cell_col + colspan - 1)
 
             # Get cell (don't write value yet if it's going to be merged)
-            cell = self.worksheet.cell(row=cell_row, column=cell_col)
+            cell = cell_at(cell_row, cell_col)
             
             # Only write value if cell is not already a MergedCell
-            from openpyxl.cell.cell import MergedCell
             if not isinstance(cell, MergedCell):
                 cell.value = text
             else:
-                logger.debug(f"Skipping value write to {cell.coordinate} - already a MergedCell")
+                logger.debug("Skipping value write to %s - already a MergedCell", cell.coordinate)
             
             # Use StyleRegistry (strict - no legacy fallback)
             if not self.style_registry or not cell_id:
@@ -125,26 +128,27 @@ class HeaderBuilderStyler:
             # Get column-specific header style (column base + header context)
             style = self.style_registry.get_style(cell_id, context='header')
             self.cell_styler.apply(cell, style)
-            logger.debug(f"Applied StyleRegistry style to header cell {cell_id}")
+            logger.debug("Applied StyleRegistry style to header cell %s", cell_id)
             
             # Apply row height ONCE per row (only on first column processed for each row)
             if cell_row not in self._rows_with_height_applied:
-                row_height = self.style_registry.get_row_height('header')
-                if row_height:
-                    self.cell_styler.apply_row_height(self.worksheet, cell_row, row_height)
-                    logger.debug(f"Applied header row height {row_height} to row {cell_row}")
+                if header_row_height:
+                    self.cell_styler.apply_row_height(self.worksheet, cell_row, header_row_height)
+                    logger.debug("Applied header row height %s to row %s", header_row_height, cell_row)
                 self._rows_with_height_applied.add(cell_row)
 
             if cell_id:
-                column_map[text] = get_column_letter(cell_col)
+                column_map[text] = column_letter(cell_col)
                 column_id_map[cell_id] = cell_col
                 # Only store colspan for NON-PARENT columns (parents with children shouldn't merge data/footer)
                 if cell_id not in parent_column_ids:
                     column_colspan[cell_id] = colspan
 
             if rowspan > 1 or colspan > 1:
-                self.worksheet.merge_cells(start_row=cell_row, start_column=cell_col,
-                                      end_row=cell_row + rowspan - 1, end_column=cell_col + colspan - 1)
+                pending_merges.append((cell_row, cell_col, cell_row + rowspan - 1, cell_col + colspan - 1))
+
+        # Header cells never overlap each other, so the merges can be registered in one pass
+        apply_merge_ranges(self.worksheet, pending_merges)
 
         return {
             'first_row_index': first_row_index,
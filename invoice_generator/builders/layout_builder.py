@@ -202,9 +202,7 @@ class LayoutBuilder:
                     )
                     logger.info(f"Text replacements applied to template state: {changes} changes made")
                 except Exception as e:
-                    logger.error(f"Failed to apply text replacements: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
+                    logger.exception(f"Failed to apply text replacements: {e}")
         
         # 3b. Template header restoration DEFERRED - will be done AFTER table building
         # This ensures template content aligns with actual column count after filtering
@@ -340,15 +338,6 @@ class LayoutBuilder:
         logger.debug(f"skip_data_table_builder = {self.skip_data_table_builder}")
         if not self.skip_data_table_builder:
             logger.info(f"Entering data table builder block")
-            sheet_inner_mapping_rules_dict = self.sheet_config.get('mappings', {})
-            add_blank_after_hdr_flag = self.sheet_config.get("add_blank_after_header", False)
-            static_content_after_hdr_dict = self.sheet_config.get("static_content_after_header", {})
-            add_blank_before_ftr_flag = self.sheet_config.get("add_blank_before_footer", False)
-            static_content_before_ftr_dict = self.sheet_config.get("static_content_before_footer", {})
-            merge_rules_after_hdr = self.sheet_config.get("merge_rules_after_header", {})
-            merge_rules_before_ftr = self.sheet_config.get("merge_rules_before_footer", {})
-            merge_rules_footer = self.sheet_config.get("merge_rules_footer", {})
-            data_cell_merging_rules = self.sheet_config.get("data_cell_merging_rule", None)
             
             # ========== Data Source Resolution ==========
             
@@ -3,7 +3,7 @@ import logging
 import openpyxl
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
-from openpyxl.utils import get_column_letter
+from openpyxl.utils import get_column_letter, range_boundaries
 from typing import List, Dict, Any, Tuple
 import copy
 
@@ -57,6 +57,10 @@ class TemplateStateBuilder:
         # Log of text replacements performed
         self.replacements_log: List[Dict[str, str]] = []
 
+        # Row-bucketed merge lookup used while capturing cells (see _merged_ranges_by_row)
+        self._merge_row_index: Dict[int, list] = {}
+        self._merge_row_index_source = None
+
         # Store default style objects for comparison
         default_workbook = openpyxl.Workbook()
         default_cell = default_workbook.active['A1']
@@ -69,12 +73,14 @@ class TemplateStateBuilder:
         # Calculate max_col based on the maximum column with content in the entire worksheet
         max_col_with_content = 0
         max_row_with_content = 0 # Initialize max_row_with_content
-        for r_idx in range(1, self.worksheet.max_row + 1):
-            for c_idx in range(1, self.worksheet.max_column + 1):
-                cell = self.worksheet.cell(row=r_idx, column=c_idx)
+        # Walk each row once via iter_rows and from the right, so a row stops at its last used cell
+        for row_cells in self.worksheet.iter_rows(min_row=1, max_row=self.worksheet.max_row,
+                                                  max_col=self.worksheet.max_column):
+            for cell in reversed(row_cells):
                 if self._has_content_or_style(cell):
-                    max_col_with_content = max(max_col_with_content, c_idx)
-                    max_row_with_content = max(max_row_with_content, r_idx) # Update max_row_with_content
+                    max_col_with_content = max(max_col_with_content, cell.column)
+                    max_row_with_content = cell.row # Rows arrive in order, so this is the max so far
+                    break
         self.max_col = max(max_col_with_content, self.num_header_cols) # Ensure it's at least num_header_cols
         self.max_row = max(max_row_with_content, self.max_row) # Update self.max_row with max_row_with_content
         
@@ -128,6 +134,24 @@ class TemplateStateBuilder:
         
         return self.column_mapping.get(template_col, template_col)
 
+    def _merge_restored_ranges(self, target_worksheet: Worksheet, merge_ranges) -> None:
+        """
+        Merge restored template ranges through worksheet.merge_cells().
+        
+        Restored rows can already carry merges, so these keep merge_cells()'s
+        check that skips a range contained in an existing merge, instead of
+        the builders' batch registration (apply_merge_ranges).
+        
+        Args:
+            target_worksheet: The worksheet to merge on
+            merge_ranges: (min_row, min_col, max_row, max_col) tuples, 1-based
+        """
+        for min_row, min_col, max_row, max_col in merge_ranges:
+            try:
+                target_worksheet.merge_cells(start_row=min_row, start_column=min_col, end_row=max_row, end_column=max_col)
+            except Exception as e:
+                if self.debug:
+                    logger.warning(f"Could not merge rows {min_row}-{max_row}, cols {min_col}-{max_col}: {e}")
 
     def _has_content_or_style(self, cell) -> bool:
         if cell.value is not None and cell.value != '':
@@ -234,11 +258,25 @@ class TemplateStateBuilder:
         
         return f"{cell_coord}: {', '.join(parts)}" if parts else None
 
+    def _merged_ranges_by_row(self, worksheet) -> Dict[int, list]:
+        """
+        Row -> merged ranges touching that row, built once per captured worksheet.
+        The template's merges do not change while its state is being captured.
+        """
+        if self._merge_row_index_source is not worksheet:
+            index: Dict[int, list] = {}
+            for merged_cell_range in worksheet.merged_cells.ranges:
+                for r in range(merged_cell_range.min_row, merged_cell_range.max_row + 1):
+                    index.setdefault(r, []).append(merged_cell_range)
+            self._merge_row_index = index
+            self._merge_row_index_source = worksheet
+        return self._merge_row_index
+
     def _get_cell_info(self, worksheet, row, col) -> Dict[str, Any]:
         cell = worksheet.cell(row=row, column=col)
         top_left_cell = cell
-        for merged_cell_range in worksheet.merged_cells.ranges:
-            if cell.coordinate in merged_cell_range:
+        for merged_cell_range in self._merged_ranges_by_row(worksheet).get(row, ()):
+            if merged_cell_range.min_col <= col <= merged_cell_range.max_col:
                 top_left_cell = worksheet.cell(row=merged_cell_range.min_row, column=merged_cell_range.min_col)
                 break
 
@@ -362,14 +400,20 @@ class TemplateStateBuilder:
         consecutive_empty_rows = 0
         footer_end_row = footer_start_row
         
-        for r_idx in range(footer_start_row, min(footer_start_row + 50, max_possible_footer_row + 1)):  # Limit search to 50 rows
+        search_end_row = min(footer_start_row + 50, max_possible_footer_row + 1)  # Limit search to 50 rows
+        
+        # Rows covered by a merge inside the search window, collected in one pass over the merges
+        merged_rows = set()
+        for merged_range in self.worksheet.merged_cells.ranges:
+            merged_rows.update(range(max(merged_range.min_row, footer_start_row), min(merged_range.max_row + 1, search_end_row)))
+        
+        for r_idx in range(footer_start_row, search_end_row):
             # Check if row has actual content (values) or is part of a merge
-            row_has_value = any(self.worksheet.cell(row=r_idx, column=c_idx).value is not None and 
-                               self.worksheet.cell(row=r_idx, column=c_idx).value != ''
-                               for c_idx in range(1, self.max_col + 1))
+            row_has_value = any(value is not None and value != ''
+                               for value in (self.worksheet.cell(row=r_idx, column=c_idx).value
+                                             for c_idx in range(1, self.max_col + 1)))
             
-            row_has_merge = any(r_idx >= merged_range.min_row and r_idx <= merged_range.max_row
-                               for merged_range in self.worksheet.merged_cells.ranges)
+            row_has_merge = r_idx in merged_rows
             
             if row_has_value or row_has_merge:
                 footer_end_row = r_idx
@@ -442,10 +486,8 @@ class TemplateStateBuilder:
             logger.debug(f"  Captured {len(footer_merges)} merged cells: {', '.join(footer_merges[:3])}" + 
                        (f" ... ({len(footer_merges)-3} more)" if len(footer_merges) > 3 else ""))
 
-        # Capture column widths
-        for c_idx in range(1, self.max_col + 1):
-            self.column_widths[c_idx] = self.worksheet.column_dimensions[get_column_letter(c_idx)].width
-        
+        # Column widths were already captured with the header (same template columns)
+
         # Validate footer capture - warn if all rows are empty
         total_non_empty_cells = sum(
             1 for row_data in self.footer_state 
@@ -578,13 +620,12 @@ class TemplateStateBuilder:
                         target_cell.number_format = last_template_cell_info['number_format']
         
         # Restore header merged cells with column mapping
+        pending_merges = []
         for merged_cell_range_str in self.header_merged_cells:
             try:
+                min_col, min_row, max_col, max_row = range_boundaries(merged_cell_range_str)
                 # Apply column mapping to merged cells if mapping is set
                 if self.column_mapping:
-                    from openpyxl.utils.cell import range_boundaries
-                    min_col, min_row, max_col, max_row = range_boundaries(merged_cell_range_str)
-                    
                     # Map the columns
                     mapped_min_col = self._get_mapped_column(min_col)
                     mapped_max_col = self._get_mapped_column(max_col)
@@ -596,20 +637,22 @@ class TemplateStateBuilder:
                         continue
                     
                     # Create adjusted merge range
-                    adjusted_range_str = f"{get_column_letter(mapped_min_col)}{min_row}:{get_column_letter(mapped_max_col)}{max_row}"
-                    target_worksheet.merge_cells(adjusted_range_str)
-                    if self.debug and merged_cell_range_str != adjusted_range_str:
-                        logger.debug(f"Merged (shifted): {merged_cell_range_str} -> {adjusted_range_str}")
-                    elif self.debug:
-                        logger.debug(f"Merged: {adjusted_range_str}")
+                    pending_merges.append((min_row, mapped_min_col, max_row, mapped_max_col))
+                    if self.debug:
+                        adjusted_range_str = f"{get_column_letter(mapped_min_col)}{min_row}:{get_column_letter(mapped_max_col)}{max_row}"
+                        if merged_cell_range_str != adjusted_range_str:
+                            logger.debug(f"Merged (shifted): {merged_cell_range_str} -> {adjusted_range_str}")
+                        else:
+                            logger.debug(f"Merged: {adjusted_range_str}")
                 else:
                     # No mapping, use original
-                    target_worksheet.merge_cells(merged_cell_range_str)
+                    pending_merges.append((min_row, min_col, max_row, max_col))
                     if self.debug:
                         logger.debug(f"Merged: {merged_cell_range_str}")
             except Exception as e:
                 if self.debug:
                     logger.warning(f"Could not merge {merged_cell_range_str}: {e}")
+        self._merge_restored_ranges(target_worksheet, pending_merges)
         
         # Restore row heights
         for row_num, height in self.row_heights.items():
@@ -757,9 +800,10 @@ class TemplateStateBuilder:
                         target_cell.number_format = last_template_cell_info['number_format']
         
         # Restore footer merged cells with offset and column mapping
+        # (collected first, then merged through _merge_restored_ranges, which keeps merge_cells()'s containment check)
+        pending_merges = []
         for merged_cell_range_str in self.footer_merged_cells:
             try:
-                from openpyxl.utils.cell import range_boundaries
                 min_col, min_row, max_col, max_row = range_boundaries(merged_cell_range_str)
                 original_span = max_col - min_col + 1  # Calculate original column span
                 
@@ -803,9 +847,9 @@ class TemplateStateBuilder:
                 # Adjust row numbers with offset
                 min_row += offset
                 max_row += offset
-                adjusted_range_str = f"{get_column_letter(min_col)}{min_row}:{get_column_letter(max_col)}{max_row}"
-                target_worksheet.merge_cells(adjusted_range_str)
+                pending_merges.append((min_row, min_col, max_row, max_col))
                 if self.debug:
+                    adjusted_range_str = f"{get_column_letter(min_col)}{min_row}:{get_column_letter(max_col)}{max_row}"
                     if merged_cell_range_str != adjusted_range_str:
                         logger.debug(f"Merged (shifted): {merged_cell_range_str} -> {adjusted_range_str}")
                     else:
@@ -813,6 +857,7 @@ class TemplateStateBuilder:
             except Exception as e:
                 if self.debug:
                     logger.warning(f"Could not merge {merged_cell_range_str}: {e}")
+        self._merge_restored_ranges(target_worksheet, pending_merges)
         
         # Restore row heights for footer rows
         for row_num, height in self.row_heights.items():
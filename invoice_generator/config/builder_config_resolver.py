@@ -17,10 +17,20 @@ import logging
 from typing import Any, Dict, Optional, Tuple
 from openpyxl.worksheet.worksheet import Worksheet
 
+from invoice_generator.data.data_preparer import parse_mapping_rules
 from invoice_generator.data.global_summary_calculator import GlobalSummaryCalculator
 
 logger = logging.getLogger(__name__)
 
+# data_source type -> invoice_data key; anything unlisted reads the standard aggregation
+_DATA_SOURCE_KEYS = {
+    'aggregation': 'standard_aggregation_results',
+    'DAF_aggregation': 'standard_aggregation_results',  # DAF uses same data structure
+    'custom_aggregation': 'custom_aggregation_results',
+    'processed_tables_multi': 'processed_tables_data',
+    'processed_tables': 'processed_tables_data',
+}
+
 
 class BuilderConfigResolver:
     """
@@ -81,6 +91,15 @@ class BuilderConfigResolver:
         
         # Cache the full sheet config
         self._sheet_config = config_loader.get_sheet_config(sheet_name)
+        self._global_summaries: Optional[Dict[str, Any]] = None
+        # Mapping rules from layout_bundle.data_flow.mappings, the same for every table of the sheet
+        self._mapping_rules: Dict[str, Any] = (
+            self._sheet_config.get('layout_config', {}).get('data_flow', {}).get('mappings', {})
+        )
+        # Column maps of the last parsed columns list, kept with the list so the identity check stays valid
+        self._column_maps_cache: Optional[Tuple[list, Dict[str, Any]]] = None
+        # Parsed mapping rules, kept with the rules and column maps they were parsed for
+        self._parsed_rules_cache: Optional[Tuple[Dict[str, Any], Dict[str, int], Dict[str, int], Dict[str, Any]]] = None
     
     # ========== Bundle Preparation Methods ==========
     
@@ -147,8 +166,7 @@ class BuilderConfigResolver:
             # Use GlobalSummaryCalculator to compute all global summaries
             # This provides clean separation: BuilderConfigResolver bundles, GlobalSummaryCalculator calculates
             try:
-                calculator = GlobalSummaryCalculator(self.invoice_data['processed_tables_data'])
-                summaries = calculator.calculate_all()
+                summaries = self._get_global_summaries()
                 
                 # Add calculated summaries to context
                 base_context.update(summaries)
@@ -162,6 +180,18 @@ class BuilderConfigResolver:
         
         return base_context
     
+    def _get_global_summaries(self) -> Dict[str, Any]:
+        """
+        Global totals (weights, pallets) over all processed tables, calculated once per resolver.
+        
+        Every context bundle needs them, and a multi-table sheet asks for a context bundle
+        for each table and again for the grand total, so the sums are not recomputed each time.
+        """
+        if self._global_summaries is None:
+            calculator = GlobalSummaryCalculator(self.invoice_data['processed_tables_data'])
+            self._global_summaries = calculator.calculate_all()
+        return self._global_summaries
+    
     def _adapt_invoice_data_for_sheet(self, table_key: Optional[str] = None) -> Dict[str, Any]:
         """
         Adapt invoice_data to provide normalized data paths for text replacements.
@@ -255,6 +285,10 @@ class BuilderConfigResolver:
                 'mapping_rules': dict (from layout_bundle.data_flow.mappings),
                 ...
             }
+        
+        Note:
+            'data_source' is the table's dict inside invoice_data itself, not a copy:
+            selecting one table by table_key allocates nothing. Builders must treat it as read-only.
         """
         layout_config = self._sheet_config.get('layout_config', {})
         
@@ -270,27 +304,39 @@ class BuilderConfigResolver:
         # - If data_source has keys like '1', '2', '3', extract the specific table
         # - If data_source is already a single table dict with keys like 'po', 'item', skip extraction
         if table_key and isinstance(data_source, dict):
-            # Check if this looks like multi-table data (has numeric string keys)
-            has_table_keys = any(str(k).isdigit() for k in data_source.keys())
+            # Keys usually arrive as the dict's own keys already; convert only once for the fallback
+            table_key_str = str(table_key)
+            table_data = data_source.get(table_key)
+            if table_data is None:
+                table_data = data_source.get(table_key_str)
             
-            if has_table_keys:
-                # Extract the specific table
-                data_source = data_source.get(str(table_key), {})
+            if table_data is not None and table_key_str.isdigit():
+                # A numeric key that resolves already proves this is multi-table data
+                data_source = table_data
+            elif any(map(str.isdigit, map(str, data_source))):
+                # Multi-table data (has numeric string keys) without this table
+                data_source = table_data if table_data is not None else {}
         
         # Construct header_info from layout_bundle.structure
         header_info = self._construct_header_info(layout_config)
         
-        # Extract mapping rules from layout_bundle.data_flow.mappings
-        mapping_rules = layout_config.get('data_flow', {}).get('mappings', {})
-        
         return {
             'data_source': data_source,
             'data_source_type': data_source_type,
             'header_info': header_info,
-            'mapping_rules': mapping_rules,
+            'mapping_rules': self._mapping_rules,
             'table_key': table_key,
         }
     
+    def get_mapping_rules(self) -> Dict[str, Any]:
+        """
+        Get the sheet's mapping rules (layout_bundle.data_flow.mappings).
+        
+        Returns:
+            Mapping rules dict, resolved once when the resolver is created
+        """
+        return self._mapping_rules
+    
     # ========== Builder-Specific Bundle Methods ==========
     
     def get_header_bundles(self) -> Tuple[Dict, Dict, Dict]:
@@ -355,7 +401,7 @@ class BuilderConfigResolver:
         
         return style_config, context_config, merged_layout_config
     
-    def get_table_data_resolver(self, table_key: Optional[str] = None):
+    def get_table_data_resolver(self, table_key: Optional[str] = None, data_config: Optional[Dict[str, Any]] = None):
         """
         Create a TableDataAdapter for preparing table-specific data.
         
@@ -364,6 +410,8 @@ class BuilderConfigResolver:
         
         Args:
             table_key: Optional table key for multi-table scenarios
+            data_config: Data bundle already built by get_data_bundle(table_key), reused
+                instead of being resolved again
         
         Returns:
             TableDataAdapter instance
@@ -382,16 +430,42 @@ class BuilderConfigResolver:
         """
         from .table_value_adapter import TableDataAdapter
         
-        data_config = self.get_data_bundle(table_key=table_key)
-        context_config = self.get_context_bundle()
+        if data_config is None:
+            data_config = self.get_data_bundle(table_key=table_key)
+        # The adapter only reads 'args' from the context; the full context bundle would re-adapt
+        # invoice_data and recompute the global summaries over every table for each call.
+        context_config = {'args': self.context_overrides.get('args', self.args)}
         layout_config = self.get_layout_bundle()
         
         return TableDataAdapter.create_from_bundles(
             data_config=data_config,
             context_config=context_config,
-            layout_config=layout_config
+            layout_config=layout_config,
+            parsed_rules=self._get_parsed_mapping_rules(
+                data_config.get('mapping_rules', {}),
+                data_config.get('header_info', {})
+            )
         )
     
+    def _get_parsed_mapping_rules(self, mapping_rules: Dict[str, Any], header_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Parse mapping rules for header_info's column maps, once per sheet.
+        
+        Every table of a sheet shares the resolver's mapping rules and cached column maps,
+        so multi-table sheets parse the rules once instead of once per table.
+        The returned dict is shared between adapters and must not be mutated.
+        """
+        column_id_map = header_info.get('column_id_map', {})
+        column_map = header_info.get('column_map', {})
+        entry = self._parsed_rules_cache
+        if entry is not None and entry[0] is mapping_rules and entry[1] is column_id_map and entry[2] is column_map:
+            return entry[3]
+        
+        idx_to_header_map = {v: k for k, v in column_map.items()}
+        parsed = parse_mapping_rules(mapping_rules, column_id_map, idx_to_header_map)
+        self._parsed_rules_cache = (mapping_rules, column_id_map, column_map, parsed)
+        return parsed
+    
     def get_footer_bundles(
         self,
         sum_ranges: Optional[list] = None,
@@ -519,6 +593,28 @@ class BuilderConfigResolver:
         DAF_mode = self.args.DAF if self.args and hasattr(self.args, 'DAF') else False
         custom_mode = self.args.custom if self.args and hasattr(self.args, 'custom') else False
         
+        # The column maps only depend on the column definitions and mode flags, not on header_row
+        # (which multi-table sheets move for every table), so this resolver parses them once per columns list.
+        entry = self._column_maps_cache
+        if entry is not None and entry[0] is columns:
+            column_maps = entry[1]
+        else:
+            column_maps = self._construct_column_maps(columns, DAF_mode, custom_mode)
+            self._column_maps_cache = (columns, column_maps)
+        
+        # second_row_index represents the second row of the header (where data writing starts after)
+        # If header is at row N, second row is at N+1
+        return {
+            'second_row_index': header_row + 1,
+            **column_maps
+        }
+    
+    def _construct_column_maps(self, columns: list, DAF_mode: bool, custom_mode: bool) -> Dict[str, Any]:
+        """
+        Build the column maps part of header_info from the bundled column definitions.
+        
+        The returned maps are cached on the resolver and shared between its header_info dicts, so they must not be mutated.
+        """
         filtered_columns = []
         for col_def in columns:
             col_id = col_def.get('id', 'unknown')
@@ -593,10 +689,7 @@ class BuilderConfigResolver:
                 # so next column (col_po) should start at column 3
                 current_idx += colspan
         
-        # second_row_index represents the second row of the header (where data writing starts after)
-        # If header is at row N, second row is at N+1
         return {
-            'second_row_index': header_row + 1,
             'column_map': column_map,
             'column_id_map': column_id_map,
             'num_columns': current_idx - 1,  # Total columns processed
@@ -617,16 +710,7 @@ class BuilderConfigResolver:
         if not self.invoice_data:
             return {}
         
-        # Map data source types to invoice_data keys
-        type_mapping = {
-            'aggregation': 'standard_aggregation_results',
-            'DAF_aggregation': 'standard_aggregation_results',  # DAF uses same data structure
-            'custom_aggregation': 'custom_aggregation_results',
-            'processed_tables_multi': 'processed_tables_data',
-            'processed_tables': 'processed_tables_data',
-        }
-        
-        data_key = type_mapping.get(data_source_type, 'standard_aggregation_results')
+        data_key = _DATA_SOURCE_KEYS.get(data_source_type, 'standard_aggregation_results')
         return self.invoice_data.get(data_key, {})
     
     def get_all_sheet_configs(self) -> Dict[str, Any]:
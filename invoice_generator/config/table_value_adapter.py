@@ -69,7 +69,8 @@ class TableDataAdapter:
         header_info: Dict[str, Any],
         DAF_mode: bool = False,
         table_key: Optional[str] = None,
-        static_content: Optional[Dict[str, Any]] = None
+        static_content: Optional[Dict[str, Any]] = None,
+        parsed_rules: Optional[Dict[str, Any]] = None
     ):
         """
         Initialize the table data resolver.
@@ -83,6 +84,8 @@ class TableDataAdapter:
             DAF_mode: Whether DAF mode is active
             table_key: Optional table key for multi-table data sources
             static_content: Static content from layout_bundle (e.g., col_static values)
+            parsed_rules: Optional mapping rules already parsed for these column maps
+                (shared between the tables of a sheet, must not be mutated)
         """
         self.data_source_type = data_source_type
         self.data_source = data_source
@@ -100,7 +103,7 @@ class TableDataAdapter:
         self.idx_to_header_map = {v: k for k, v in self.column_map.items()}
         
         # Cached parsed rules
-        self._parsed_rules = None
+        self._parsed_rules = parsed_rules
     
     def resolve(self) -> Dict[str, Any]:
         """
@@ -215,7 +218,8 @@ class TableDataAdapter:
     def create_from_bundles(
         data_config: Dict[str, Any],
         context_config: Dict[str, Any],
-        layout_config: Optional[Dict[str, Any]] = None
+        layout_config: Optional[Dict[str, Any]] = None,
+        parsed_rules: Optional[Dict[str, Any]] = None
     ) -> 'TableDataAdapter':
         """
         Factory method to create TableDataAdapter from bundle configs.
@@ -227,6 +231,7 @@ class TableDataAdapter:
             data_config: Data bundle from BuilderConfigResolver.get_data_bundle()
             context_config: Context bundle from BuilderConfigResolver.get_context_bundle()
             layout_config: Optional layout bundle from BuilderConfigResolver.get_layout_bundle()
+            parsed_rules: Optional mapping rules already parsed for data_config's header_info
         
         Returns:
             TableDataAdapter instance
@@ -247,7 +252,8 @@ class TableDataAdapter:
             header_info=data_config.get('header_info', {}),
             DAF_mode=DAF_mode,
             table_key=data_config.get('table_key'),
-            static_content=static_content
+            static_content=static_content,
+            parsed_rules=parsed_rules
         )
 
 
@@ -196,14 +196,21 @@ def prepare_data_rows(
         num_data_rows_from_source = len(DAF_data)
         id_to_data_key_map = {"col_po": "combined_po", "col_item": "combined_item", "col_desc": "combined_description", "col_qty_sf": "total_sqft", "col_amount": "total_amount"}
         price_col_idx = column_id_map.get("col_unit_price")
+        # First mapping rule per column id (supports both 'id' and 'column'), looked up once instead of per empty cell
+        rules_by_id = {}
+        for rule in dynamic_mapping_rules.values():
+            rules_by_id.setdefault(rule.get("id") or rule.get("column"), rule)
+        # (col_id, data_key, target_col_idx, fallback rule) for the columns present in the header, resolved once
+        daf_columns = []
+        for col_id, data_key in id_to_data_key_map.items():
+            target_col_idx = column_id_map.get(col_id)
+            if target_col_idx:
+                daf_columns.append((col_id, data_key, target_col_idx, rules_by_id.get(col_id, {})))
         
         for row_key in sorted(DAF_data.keys()):
             row_value_dict = DAF_data.get(row_key, {})
             row_dict = {}
-            for col_id, data_key in id_to_data_key_map.items():
-                target_col_idx = column_id_map.get(col_id)
-                if not target_col_idx: continue
-
+            for col_id, data_key, target_col_idx, fallback_rule in daf_columns:
                 data_value = row_value_dict.get(data_key)
                 is_empty = data_value is None or (isinstance(data_value, str) and not data_value.strip())
 
@@ -212,14 +219,7 @@ def prepare_data_rows(
                     if col_id == "col_desc":
                         dynamic_desc_used = True
                 else:
-                    mapping_rule_for_id = {}
-                    for rule in dynamic_mapping_rules.values():
-                        # Support both 'id' and 'column'
-                        rule_id = rule.get("id") or rule.get("column")
-                        if rule_id == col_id:
-                            mapping_rule_for_id = rule
-                            break
-                    _apply_fallback(row_dict, target_col_idx, mapping_rule_for_id, DAF_mode)
+                    _apply_fallback(row_dict, target_col_idx, fallback_rule, DAF_mode)
 
             if price_col_idx:
                 row_dict[price_col_idx] = {"type": "formula", "template": "{col_ref_1}{row}/{col_ref_0}{row}", "inputs": ["col_qty_sf", "col_amount"]}
@@ -231,16 +231,26 @@ def prepare_data_rows(
         num_data_rows_from_source = len(custom_data)
         price_col_idx = column_id_map.get("col_unit_price")
         desc_col_idx_local = column_id_map.get("col_desc")
+        # Fixed target columns and the fallback rules' columns, resolved once instead of per row
+        po_col_idx = column_id_map.get("col_po")
+        item_col_idx = column_id_map.get("col_item")
+        sqft_col_idx = column_id_map.get("col_qty_sf")
+        amount_col_idx = column_id_map.get("col_amount")
+        fallback_rules = []
+        for mapping_rule in dynamic_mapping_rules.values():
+            target_col_idx = column_id_map.get(mapping_rule.get("id") or mapping_rule.get("column"))
+            if target_col_idx:
+                fallback_rules.append((target_col_idx, mapping_rule))
 
         for key_tuple, value_dict in custom_data.items():
             if not isinstance(key_tuple, tuple) or len(key_tuple) < 4: continue
             
             row_dict = {}
             # Directly map known values first
-            row_dict[column_id_map.get("col_po")] = key_tuple[0]
-            row_dict[column_id_map.get("col_item")] = key_tuple[1]
-            row_dict[column_id_map.get("col_qty_sf")] = _to_numeric(value_dict.get("sqft_sum"))
-            row_dict[column_id_map.get("col_amount")] = _to_numeric(value_dict.get("amount_sum"))
+            row_dict[po_col_idx] = key_tuple[0]
+            row_dict[item_col_idx] = key_tuple[1]
+            row_dict[sqft_col_idx] = _to_numeric(value_dict.get("sqft_sum"))
+            row_dict[amount_col_idx] = _to_numeric(value_dict.get("amount_sum"))
 
             if desc_col_idx_local:
                 desc_value = key_tuple[3]
@@ -249,10 +259,8 @@ def prepare_data_rows(
                     dynamic_desc_used = True
             
             # Apply fallbacks for any unmapped columns based on DAF_mode
-            for header, mapping_rule in dynamic_mapping_rules.items():
-                target_id = mapping_rule.get("id") or mapping_rule.get("column")
-                target_col_idx = column_id_map.get(target_id)
-                if not target_col_idx or target_col_idx in row_dict:
+            for target_col_idx, mapping_rule in fallback_rules:
+                if target_col_idx in row_dict:
                     continue
 
                 _apply_fallback(row_dict, target_col_idx, mapping_rule, DAF_mode)
@@ -264,12 +272,35 @@ def prepare_data_rows(
 
     # --- Unified Handler for Aggregation & Processed Tables (TYPO FIXED) ---
     else:
-        normalized_data = []
+        # Resolve every rule's target column and source keys once; the row loop only does lookups.
+        compiled_rules = []
+        for header, mapping_rule in dynamic_mapping_rules.items():
+            target_id = mapping_rule.get("id") or mapping_rule.get("column")
+            target_col_idx = column_id_map.get(target_id)
+            if not target_col_idx: continue
+            # Support both legacy 'key_index' and bundled 'source_key'
+            key_idx = mapping_rule.get('key_index')
+            if key_idx is None:
+                key_idx = mapping_rule.get('source_key')
+            # Support both legacy 'value_key' and bundled 'source_value'
+            val_key = mapping_rule.get('value_key') or mapping_rule.get('source_value')
+            compiled_rules.append((header, mapping_rule, target_id, target_col_idx, key_idx, val_key))
+
+        # One list of source values per row, aligned with compiled_rules
+        row_values = []
         if data_source_type == 'aggregation':
             aggregation_data = data_source or {}
             num_data_rows_from_source = len(aggregation_data)
             for key_tuple, value_dict in aggregation_data.items():
-                normalized_data.append({'key_tuple': key_tuple, 'value_dict': value_dict})
+                values = []
+                for _, _, _, _, key_idx, val_key in compiled_rules:
+                    if key_idx is not None and key_idx < len(key_tuple):
+                        values.append(key_tuple[key_idx])
+                    elif val_key:
+                        values.append(value_dict.get(val_key))
+                    else:
+                        values.append(None)
+                row_values.append(values)
 
         elif data_source_type in ['processed_tables', 'processed_tables_multi']:
             table_data = data_source or {}
@@ -278,52 +309,32 @@ def prepare_data_rows(
                 num_data_rows_from_source = max_len
                 raw_pallet_counts = table_data.get("pallet_count", [])
                 pallet_counts_for_rows = raw_pallet_counts[:max_len] + [0] * (max_len - len(raw_pallet_counts)) if isinstance(raw_pallet_counts, list) else [0] * max_len
-                for i in range(max_len):
-                    normalized_data.append({'table_row_index': i, 'table_data': table_data})
-        
-        for item in normalized_data:
-            row_dict = {}
-            for header, mapping_rule in dynamic_mapping_rules.items():
-                target_id = mapping_rule.get("id") or mapping_rule.get("column")
-                target_col_idx = column_id_map.get(target_id)
-                if not target_col_idx: continue
-
-                data_value = None
-                if 'key_tuple' in item:
-                    key_tuple, value_dict = item['key_tuple'], item['value_dict']
-                    # Support both legacy 'key_index' and bundled 'source_key'
-                    key_idx = mapping_rule.get('key_index')
-                    if key_idx is None:
-                        key_idx = mapping_rule.get('source_key')
-                        
-                    if key_idx is not None and key_idx < len(key_tuple):
-                        data_value = key_tuple[key_idx]
-                    else:
-                        # Support both legacy 'value_key' and bundled 'source_value'
-                        val_key = mapping_rule.get('value_key') or mapping_rule.get('source_value')
-                        if val_key:
-                            data_value = value_dict.get(val_key)
-                            
-                elif 'table_row_index' in item:
-                    i, table_data = item['table_row_index'], item['table_data']
-                    source_list = table_data.get(header, [])
-                    if i < len(source_list):
-                        data_value = source_list[i]
+                # Data is already columnar: pad each column to max_len once, then transpose into rows
+                source_columns = [
+                    list(source_list[:max_len]) + [None] * (max_len - len(source_list))
+                    for source_list in (table_data.get(header, []) for header, *_ in compiled_rules)
+                ]
+                row_values = list(zip(*source_columns)) if source_columns else [()] * max_len
 
+        amount_col_idx = column_id_map.get("col_amount") if data_source_type == 'aggregation' else None
+        # Per-column decisions (numeric coercion, description tracking) don't change between rows
+        row_rules = [(mapping_rule, target_col_idx, target_id in NUMERIC_IDS, target_id == 'col_desc')
+                     for _, mapping_rule, target_id, target_col_idx, _, _ in compiled_rules]
+        for values in row_values:
+            row_dict = {}
+            for (mapping_rule, target_col_idx, is_numeric, is_desc), data_value in zip(row_rules, values):
                 is_empty = data_value is None or (isinstance(data_value, str) and not data_value.strip())
                 
                 if not is_empty:
-                    if target_id in NUMERIC_IDS: data_value = _to_numeric(data_value)
+                    if is_numeric: data_value = _to_numeric(data_value)
                     row_dict[target_col_idx] = data_value
-                    if target_id == 'col_desc':
+                    if is_desc:
                         dynamic_desc_used = True
                 else:
                     _apply_fallback(row_dict, target_col_idx, mapping_rule, DAF_mode)
             
-            if data_source_type == 'aggregation':
-                amount_col_idx = column_id_map.get("col_amount")
-                if amount_col_idx:
-                    row_dict[amount_col_idx] = {"type": "formula", "template": "{col_ref_1}{row}*{col_ref_0}{row}", "inputs": ["col_qty_sf", "col_unit_price"]}
+            if amount_col_idx:
+                row_dict[amount_col_idx] = {"type": "formula", "template": "{col_ref_1}{row}*{col_ref_0}{row}", "inputs": ["col_qty_sf", "col_unit_price"]}
             
             data_rows_prepared.append(row_dict)
 
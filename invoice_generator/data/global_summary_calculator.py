@@ -6,7 +6,7 @@ This includes total weights, pallet counts, and other cross-table summaries.
 """
 
 from typing import Any, Dict
-from ..utils.math_utils import safe_float_convert, safe_int_convert
+from ..utils.math_utils import safe_float_convert, sum_pallet_counts
 import logging
 
 logger = logging.getLogger(__name__)
@@ -120,10 +120,7 @@ class GlobalSummaryCalculator:
         total_pallets = 0
         
         for table_key, table_data in self.processed_tables_data.items():
-            pallet_values = table_data.get('pallet_count', [])
-            
-            for val in pallet_values:
-                total_pallets += safe_int_convert(val)
+            total_pallets += sum_pallet_counts(table_data.get('pallet_count', []))
         
         logger.debug(f"Total pallets: {total_pallets}")
         return total_pallets
@@ -3,7 +3,7 @@ from typing import Any, Dict, List, Optional, Tuple, Union
 from decimal import Decimal
 
 from invoice_generator.styling.models import FooterData
-from ..utils.math_utils import safe_float_convert, safe_int_convert
+from ..utils.math_utils import safe_float_convert, safe_int_convert, sum_pallet_counts
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +51,7 @@ class TableCalculator:
         pallet_counts = resolved_data.get('pallet_counts', [])
         
         # Calculate total pallets
-        self.total_pallets = sum(safe_int_convert(p) for p in pallet_counts)
+        self.total_pallets = sum_pallet_counts(pallet_counts)
         
         # Process each row
         for i, row_data in enumerate(data_rows):
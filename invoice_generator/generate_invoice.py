@@ -257,8 +257,9 @@ def generate_metadata(output_path: Path, status: str, execution_time: float, she
                     continue # Skip malformed rows
 
         # 4. Summary Statistics
-        total_pcs = sum(int(i["pcs"]) for i in packing_list_items if str(i["pcs"]).isdigit())
-        total_sqft = sum(float(i["sqft"]) for i in packing_list_items if str(i["sqft"]).replace('.', '', 1).isdigit())
+        isdigit = str.isdigit  # Bound once for the per-item filters
+        total_pcs = sum(int(i["pcs"]) for i in packing_list_items if isdigit(str(i["pcs"])))
+        total_sqft = sum(float(i["sqft"]) for i in packing_list_items if isdigit(str(i["sqft"]).replace('.', '', 1)))
         total_pallets = sum(int(i["pallet_count"]) for i in packing_list_items if str(i["pallet_count"]).isdigit())
         
         # Calculate total amount (need amount column which might be missing in item dict if not added above)
@@ -10,6 +10,14 @@ class SheetProcessor(ABC):
     Abstract base class for processing a single worksheet in an invoice workbook.
     Defines the common interface for all concrete processor implementations.
     """
+    # Fixed per-sheet state; subclasses that add no attributes declare __slots__ = () to stay dict-free
+    __slots__ = (
+        'template_workbook', 'output_workbook', 'template_worksheet', 'output_worksheet',
+        'workbook', 'worksheet', 'sheet_name', 'sheet_config', 'data_mapping_config',
+        'data_source_indicator', 'invoice_data', 'args', 'final_grand_total_pallets',
+        'config_loader', 'processing_successful', '_use_bundled',
+    )
+
     def __init__(
         self,
         template_workbook: Workbook,
@@ -57,11 +65,8 @@ class SheetProcessor(ABC):
         self.invoice_data = invoice_data
         self.args = cli_args
         self.final_grand_total_pallets = final_grand_total_pallets
-        self.config_loader = config_loader  # Store config loader for resolver usage
+        self.config_loader = config_loader  # Store config loader for resolver and direct bundled config access
         self.processing_successful = True
-        
-        # New: Store config loader for direct bundled config access
-        self.config_loader = config_loader
         self._use_bundled = config_loader is not None
 
     @abstractmethod
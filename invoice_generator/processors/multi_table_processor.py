@@ -1,16 +1,13 @@
 # invoice_generator/processors/multi_table_processor.py
-import sys
 import logging
-import traceback
-from collections import defaultdict
-from typing import Any, Dict, List, Optional, Tuple
-
-from openpyxl.utils import get_column_letter
+from collections import ChainMap, defaultdict
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
 
 from .base_processor import SheetProcessor
 from ..builders.layout_builder import LayoutBuilder
 from ..builders.footer_builder import FooterBuilder
-from ..styling.models import StylingConfigModel, FooterData
+from ..styling.models import StylingConfigModel, make_styling_config_model
 from ..config.builder_config_resolver import BuilderConfigResolver
 from ..builders.template_state_builder import TemplateStateBuilder
 from ..utils.text_replacement_rules import build_replacement_rules
@@ -18,11 +15,26 @@ from ..extractors.header_extractor import HeaderExtractor
 
 logger = logging.getLogger(__name__)
 
+# Layered over the sheet's footer config for the grand total row (read-only, shared by every sheet)
+_GRAND_TOTAL_FOOTER_OVERRIDE = MappingProxyType({"type": "grand_total"})
+
+
+def _table_sort_key(table_key) -> float:
+    """Orders numeric table keys ('1', '2', ... or ints) numerically; anything else goes last."""
+    if isinstance(table_key, int):
+        return table_key
+    if isinstance(table_key, str) and table_key.isdigit():
+        return int(table_key)
+    return float('inf')
+
+
 class MultiTableProcessor(SheetProcessor):
     """
     Processes a worksheet that contains multiple, repeating blocks of tables,
     such as a packing list. Uses LayoutBuilder for each table iteration.
     """
+    # Set only when template text replacement runs; generate_invoice reads them via hasattr()
+    __slots__ = ('replacements_log', 'header_info')
 
     def process(self) -> bool:
         """
@@ -30,8 +42,16 @@ class MultiTableProcessor(SheetProcessor):
         """
         logger.info(f"Processing sheet '{self.sheet_name}' as multi-table/packing list")
         
+        # Every table is merged, styled and summed by random cell access, and the template
+        # footer is restored after the last table; openpyxl's write-only mode supports none of that.
+        if getattr(self.output_workbook, 'write_only', False):
+            logger.error(f"Cannot process multi-table sheet '{self.sheet_name}' into a write-only workbook")
+            return False
+        
         # 1. Resolve Data
-        all_tables_data, table_keys = self._resolve_all_tables_data()
+        # One resolver serves every table: its bundles don't depend on the table, which is passed per call
+        resolver = self._create_resolver()
+        all_tables_data, table_keys = self._resolve_all_tables_data(resolver)
         if not all_tables_data:
             return True  # Nothing to do
 
@@ -43,23 +63,34 @@ class MultiTableProcessor(SheetProcessor):
         # 3. Initialize Tracking Variables
         structure_config = self.sheet_config.get('structure', {}) if self.sheet_config else {}
         current_row = structure_config.get('header_row', 21)
+        total_tables = len(table_keys)
+        last_header_info = None
+        table_log = []  # (table_key, first_row, last_row, pallets), logged once after the loop
+        
+        # The grand-total accounting below only feeds the Grand Total row, which single-table
+        # sheets don't get; for them the loop runs once and skips straight to the footer restore
+        needs_grand_total = total_tables > 1
         all_data_ranges = []
         grand_total_pallets = 0
-        last_header_info = None
         dynamic_desc_used = False
-        
         # Use defaultdict for safer aggregation
-        aggregated_leather_summary = defaultdict(lambda: defaultdict(float))
+        aggregated_leather_summary = defaultdict(lambda: defaultdict(float)) if needs_grand_total else None
 
         # 4. Process Each Table
+        # Style and context bundles are the same for every table; only the layout bundle is
+        # patched per table, so it is still fetched fresh (a new top-level dict) per iteration.
+        style_config = resolver.get_style_bundle()
+        context_config = resolver.get_context_bundle(enable_text_replacement=False)
         for i, table_key in enumerate(table_keys):
             result = self._process_single_table(
                 table_key=table_key,
                 index=i,
-                total_tables=len(table_keys),
+                total_tables=total_tables,
                 current_row=current_row,
-                all_tables_data=all_tables_data,
-                template_state_builder=template_state_builder
+                template_state_builder=template_state_builder,
+                resolver=resolver,
+                style_config=style_config,
+                context_config=context_config
             )
             
             if not result:
@@ -70,11 +101,14 @@ class MultiTableProcessor(SheetProcessor):
              table_dynamic_desc, table_leather_summary) = result
             
             # Update tracking
+            table_log.append((table_key, current_row, next_row - 1, table_pallets))
             current_row = next_row
+            last_header_info = header_info
+            if not needs_grand_total:
+                continue
             grand_total_pallets += table_pallets
             if data_range:
                 all_data_ranges.append(data_range)
-            last_header_info = header_info
             if table_dynamic_desc:
                 dynamic_desc_used = True
             
@@ -85,7 +119,7 @@ class MultiTableProcessor(SheetProcessor):
                         aggregated_leather_summary[l_type][col_id] += val
 
         # 5. Build Grand Total Row
-        if len(table_keys) > 1 and last_header_info:
+        if needs_grand_total and last_header_info:
             current_row = self._build_grand_total_row(
                 current_row=current_row,
                 grand_total_pallets=grand_total_pallets,
@@ -94,18 +128,22 @@ class MultiTableProcessor(SheetProcessor):
                 all_tables_data=all_tables_data,
                 table_keys=table_keys,
                 aggregated_leather_summary=aggregated_leather_summary,
-                dynamic_desc_used=dynamic_desc_used
+                dynamic_desc_used=dynamic_desc_used,
+                resolver=resolver,
+                style_config=style_config
             )
 
         # 6. Restore Template Footer
-        self._restore_template_footer(template_state_builder, current_row, table_keys)
+        self._restore_template_footer(template_state_builder, current_row, table_keys, resolver)
         
-        logger.info(f"Successfully processed {len(table_keys)} tables for sheet '{self.sheet_name}'.")
+        logger.info("Successfully processed %d tables for sheet '%s' (table, rows, pallets): %s",
+                    total_tables, self.sheet_name,
+                    ", ".join(f"{key} {first}-{last} {pallets}" for key, first, last, pallets in table_log))
         return True
 
-    def _resolve_all_tables_data(self) -> Tuple[Optional[Dict], List]:
-        """Resolves all tables data using BuilderConfigResolver."""
-        initial_resolver = BuilderConfigResolver(
+    def _create_resolver(self) -> BuilderConfigResolver:
+        """Creates the BuilderConfigResolver shared by every table, the grand total and the footer restore."""
+        return BuilderConfigResolver(
             config_loader=self.config_loader,
             sheet_name=self.sheet_name,
             worksheet=self.output_worksheet,
@@ -113,19 +151,20 @@ class MultiTableProcessor(SheetProcessor):
             invoice_data=self.invoice_data,
             pallets=0
         )
-        
-        all_tables_data = initial_resolver._get_data_source_for_type('processed_tables_multi')
+
+    def _resolve_all_tables_data(self, resolver: BuilderConfigResolver) -> Tuple[Optional[Dict], List]:
+        """Resolves all tables data using BuilderConfigResolver."""
+        all_tables_data = resolver._get_data_source_for_type('processed_tables_multi')
         if not all_tables_data or not isinstance(all_tables_data, dict):
             logger.warning(f"'processed_tables_data' not found/valid. Skipping '{self.sheet_name}'")
             return None, []
 
-        table_keys = sorted(all_tables_data.keys(), key=lambda x: int(x) if str(x).isdigit() else float('inf'))
+        table_keys = sorted(all_tables_data, key=_table_sort_key) if len(all_tables_data) > 1 else list(all_tables_data)
         logger.info(f"Found {len(table_keys)} tables to process: {table_keys}")
         return all_tables_data, table_keys
 
     def _capture_template_state(self):
         """Captures template state (header/footer) for reuse."""
-        from ..builders.template_state_builder import TemplateStateBuilder
         logger.info(f"[MultiTableProcessor] Capturing template state once for all tables")
         
         layout_config = self.sheet_config.get('layout_config', {}) if self.sheet_config else {}
@@ -171,36 +210,23 @@ class MultiTableProcessor(SheetProcessor):
             logger.critical(f"CRITICAL: Failed to capture template state: {e}")
             return None
 
-    def _process_single_table(self, table_key, index, total_tables, current_row, all_tables_data, template_state_builder):
+    def _process_single_table(self, table_key, index, total_tables, current_row, template_state_builder, resolver,
+                              style_config, context_config):
         """Processes a single table iteration."""
         is_first_table = (index == 0)
         is_last_table = (index == total_tables - 1)
-        logger.info(f"Processing table '{table_key}' ({index+1}/{total_tables})")
-        
-        resolver = BuilderConfigResolver(
-            config_loader=self.config_loader,
-            sheet_name=self.sheet_name,
-            worksheet=self.output_worksheet,
-            args=self.args,
-            invoice_data=self.invoice_data,
-            pallets=0
-        )
+        logger.debug("Processing table '%s' (%d/%d)", table_key, index + 1, total_tables)
         
-        style_config = resolver.get_style_bundle()
-        context_config = resolver.get_context_bundle(enable_text_replacement=False)
         layout_config = resolver.get_layout_bundle()
         
         # Resolve table data
-        table_data_resolver = resolver.get_table_data_resolver(table_key=str(table_key))
+        table_data_resolver = resolver.get_table_data_resolver(table_key=table_key)
         resolved_data = table_data_resolver.resolve()
         layout_config['resolved_data'] = resolved_data
         
-        # Override header row position
-        if not 'structure' in layout_config.get('sheet_config', {}):
-            if 'sheet_config' not in layout_config:
-                layout_config['sheet_config'] = {}
-            layout_config['sheet_config']['structure'] = {}
-        layout_config['sheet_config']['structure']['header_row'] = current_row
+        # Override header row position in place. The structure dict is the sheet's layout config,
+        # which LayoutBuilder also reads through all_sheet_configs, so no per-table copy is made.
+        layout_config.setdefault('sheet_config', {}).setdefault('structure', {})['header_row'] = current_row
         
         layout_config['enable_text_replacement'] = False
         layout_config['skip_template_header_restoration'] = (not is_first_table)
@@ -221,18 +247,18 @@ class MultiTableProcessor(SheetProcessor):
             logger.error(f"Failed to build layout for table '{table_key}'")
             return None
         
-        # Calculate next row
-        next_row = layout_builder.next_row_after_footer
-        if not is_last_table:
-            next_row += 1
+        # Calculate next row (next_row_after_footer is a plain attribute set once by build())
+        next_row = layout_builder.next_row_after_footer + (0 if is_last_table else 1)
             
         # Retrieve pallet count from LayoutBuilder (calculated by TableCalculator)
-        table_pallets = layout_builder.footer_data.total_pallets if layout_builder.footer_data else 0
+        footer_data = layout_builder.footer_data
+        table_pallets = footer_data.total_pallets if footer_data else 0
         
         # Get data range
+        data_start_row, data_end_row = layout_builder.data_start_row, layout_builder.data_end_row
         data_range = None
-        if layout_builder.data_start_row > 0 and layout_builder.data_end_row >= layout_builder.data_start_row:
-            data_range = (layout_builder.data_start_row, layout_builder.data_end_row)
+        if data_start_row > 0 and data_end_row >= data_start_row:
+            data_range = (data_start_row, data_end_row)
             
         return (
             next_row,
@@ -244,42 +270,33 @@ class MultiTableProcessor(SheetProcessor):
         )
 
     def _build_grand_total_row(self, current_row, grand_total_pallets, all_data_ranges, last_header_info, 
-                             all_tables_data, table_keys, aggregated_leather_summary, dynamic_desc_used):
+                             all_tables_data, table_keys, aggregated_leather_summary, dynamic_desc_used, resolver,
+                             style_config):
         """Builds the Grand Total row after all tables."""
         logger.info("Adding Grand Total Row")
         
-        grand_total_resolver = BuilderConfigResolver(
-            config_loader=self.config_loader,
-            sheet_name=self.sheet_name,
-            worksheet=self.output_worksheet,
-            args=self.args,
-            invoice_data=self.invoice_data,
-            pallets=grand_total_pallets
-        )
+        # The sheet's resolver and the style bundle the tables used serve here too: neither depends
+        # on the pallet count, and the footer data below gets the grand total passed explicitly.
+        gt_layout_config = resolver.get_layout_bundle()
         
-        gt_style_config = grand_total_resolver.get_style_bundle()
-        gt_layout_config = grand_total_resolver.get_layout_bundle()
-        
-        # Prepare styling model
-        styling_model = gt_style_config.get('styling_config')
+        # Prepare styling model (dict styling is validated once per distinct config, see make_styling_config_model)
+        styling_model = style_config.get('styling_config')
         if styling_model and not isinstance(styling_model, StylingConfigModel):
             if isinstance(styling_model, dict) and 'columns' in styling_model and 'row_contexts' in styling_model:
                 pass
             else:
                 try:
-                    styling_model = StylingConfigModel(**styling_model)
+                    styling_model = make_styling_config_model(styling_model)
                 except Exception as e:
                     logger.warning(f"Could not create StylingConfigModel: {e}")
                     styling_model = None
         
-        # Prepare footer config
+        # Prepare footer config (add_ons are controlled via the footer config dictionary)
         sheet_config = gt_layout_config.get('sheet_config', {})
-        footer_config = sheet_config.get('footer', {}).copy()
-        footer_config["type"] = "grand_total"
+        footer_config = ChainMap(_GRAND_TOTAL_FOOTER_OVERRIDE, sheet_config.get('footer', {}))
         
-        # Legacy DAF summary logic removed - add_ons are now controlled via dictionary config
-        # if sheet_config.get('content', {}).get("summary", False) and self.args.DAF:
-        #     footer_config["add_ons"] = ["summary"]
+        # One plain-dict snapshot of the aggregated leather totals serves both the footer data and the builder
+        leather_summary = dict(aggregated_leather_summary)
         
         # Calculate overall data range
         if all_data_ranges:
@@ -290,12 +307,12 @@ class MultiTableProcessor(SheetProcessor):
             overall_data_end = current_row - 1
             
         # Create FooterData using resolver to ensure normalized data (including global weights)
-        footer_data = grand_total_resolver.get_footer_data(
+        footer_data = resolver.get_footer_data(
             footer_row_start_idx=current_row,
             data_start_row=overall_data_start,
             data_end_row=overall_data_end,
             pallet_count=grand_total_pallets,
-            leather_summary=dict(aggregated_leather_summary),
+            leather_summary=leather_summary,
             weight_summary={'net': 0.0, 'gross': 0.0}  # Will be auto-filled with global weights by resolver
         )
         
@@ -315,29 +332,23 @@ class MultiTableProcessor(SheetProcessor):
                 'footer_config': footer_config,
                 'all_tables_data': all_tables_data,
                 'table_keys': table_keys,
-                'mapping_rules': gt_layout_config.get('sheet_config', {}).get('data_flow', {}).get('mappings', {}),
+                'mapping_rules': resolver.get_mapping_rules(),
                 'DAF_mode': self.args.DAF,
                 'override_total_text': None,
-                'leather_summary': dict(aggregated_leather_summary)
+                'leather_summary': leather_summary
             }
         )
         
         return footer_builder.build()
 
-    def _restore_template_footer(self, template_state_builder, current_row, table_keys):
+    def _restore_template_footer(self, template_state_builder, current_row, table_keys, resolver):
         """Restores the template footer at the end."""
         logger.info(f"[MultiTableProcessor] Restoring template footer after row {current_row}")
         
         actual_num_cols = None
         if table_keys:
-            first_resolver = BuilderConfigResolver(
-                config_loader=self.config_loader,
-                sheet_name=self.sheet_name,
-                worksheet=self.output_worksheet,
-                args=self.args,
-                invoice_data=self.invoice_data
-            )
-            _, _, first_layout_cfg = first_resolver.get_layout_bundles_with_data(table_key=table_keys[0])
+            # Only the column structure is needed, which is the same for every table
+            first_layout_cfg = resolver.get_layout_bundle()
             if first_layout_cfg and 'sheet_config' in first_layout_cfg:
                 bundled_columns = first_layout_cfg['sheet_config'].get('structure', {}).get('columns', [])
                 if bundled_columns:
@@ -350,5 +361,4 @@ class MultiTableProcessor(SheetProcessor):
                 actual_num_cols=actual_num_cols
             )
         except Exception as e:
-            logger.error(f"❌ Failed to restore template footer: {e}")
-            logger.error(traceback.format_exc())
+            logger.exception("❌ Failed to restore template footer: %s", e)
@@ -1,10 +1,10 @@
 # invoice_generator/processors/single_table_processor.py
-import sys
 import logging
+from decimal import Decimal
 from .base_processor import SheetProcessor
-from ..utils import text_replace_utils
 from ..builders.layout_builder import LayoutBuilder
 from ..config.builder_config_resolver import BuilderConfigResolver
+from ..utils.math_utils import sum_decimal_values
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +13,8 @@ class SingleTableProcessor(SheetProcessor):
     Processes a worksheet that is configured to have a single main data table.
     This includes writing a header, filling the table, and applying styles.
     """
+    __slots__ = ()
+
     def process(self) -> bool:
         """
         Executes the logic for processing a single-table sheet using the builder pattern.
@@ -20,32 +22,19 @@ class SingleTableProcessor(SheetProcessor):
         logger.info(f"Processing sheet '{self.sheet_name}' as single table/aggregation")
         
         # Calculate weight totals from processed_tables_data (similar to pallet totals)
-        from decimal import Decimal, InvalidOperation
         total_net_weight = Decimal('0')
         total_gross_weight = Decimal('0')
         
         if self.invoice_data and 'processed_tables_data' in self.invoice_data:
             processed_tables = self.invoice_data['processed_tables_data']
             # For single table sheets, use first table (usually '1')
-            first_table_key = list(processed_tables.keys())[0] if processed_tables else None
+            first_table_key = next(iter(processed_tables), None) if processed_tables else None
             if first_table_key:
                 table_data = processed_tables[first_table_key]
-                net_weights = table_data.get('net', [])
-                gross_weights = table_data.get('gross', [])
-                
-                for weight in net_weights:
-                    try:
-                        total_net_weight += Decimal(str(weight))
-                    except (InvalidOperation, TypeError, ValueError):
-                        continue
-                
-                for weight in gross_weights:
-                    try:
-                        total_gross_weight += Decimal(str(weight))
-                    except (InvalidOperation, TypeError, ValueError):
-                        continue
+                total_net_weight = sum_decimal_values(table_data.get('net', []))
+                total_gross_weight = sum_decimal_values(table_data.get('gross', []))
         
-        logger.debug(f"Calculated weight totals for {self.sheet_name}: N.W={total_net_weight}, G.W={total_gross_weight}")
+        logger.debug("Calculated weight totals for %s: N.W=%s, G.W=%s", self.sheet_name, total_net_weight, total_gross_weight)
         
         # Use BuilderConfigResolver to prepare bundles cleanly
         resolver = BuilderConfigResolver(
@@ -70,9 +59,11 @@ class SingleTableProcessor(SheetProcessor):
         layout_config['enable_text_replacement'] = False
         layout_config['skip_data_table_builder'] = False  # IMPORTANT: Enable data table builder to use resolver
         
-        logger.debug(f"layout_config keys: {list(layout_config.keys())}")
-        logger.debug(f"skip_data_table_builder in layout_config: {layout_config.get('skip_data_table_builder', 'NOT SET')}")
-        logger.debug(f"skip_data_table_builder in sheet_config: {layout_config.get('sheet_config', {}).get('skip_data_table_builder', 'NOT SET')}")
+        # Config diagnostics are only gathered when DEBUG is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("layout_config keys: %s", list(layout_config))
+            logger.debug("skip_data_table_builder in layout_config: %s", layout_config.get('skip_data_table_builder', 'NOT SET'))
+            logger.debug("skip_data_table_builder in sheet_config: %s", layout_config.get('sheet_config', {}).get('skip_data_table_builder', 'NOT SET'))
         
         # Get data bundle to extract header_info and mapping_rules
         data_bundle = resolver.get_data_bundle()
@@ -83,18 +74,16 @@ class SingleTableProcessor(SheetProcessor):
         # NOTE: header_info from config is just column metadata, NOT styled Excel rows
         # HeaderBuilder still needs to run to write the actual styled header rows
         
-        logger.debug(f"header_info keys: {list(data_bundle.get('header_info', {}).keys())}")
+        logger.debug("header_info keys: %s", data_bundle.get('header_info', {}).keys())
         
         # NEW: Use TableDataAdapter to prepare data
         try:
-            table_resolver = resolver.get_table_data_resolver()
+            table_resolver = resolver.get_table_data_resolver(data_config=data_bundle)
             resolved_data = table_resolver.resolve()
             layout_config['resolved_data'] = resolved_data
             logger.info("Successfully resolved table data using TableDataAdapter")
         except Exception as e:
-            logger.error(f"Error resolving table data: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"Error resolving table data: {e}")
             return False
         
         # Use LayoutBuilder to orchestrate the entire layout construction
@@ -6,13 +6,64 @@ translating style dictionaries into openpyxl Font, Alignment, Fill, Border objec
 """
 
 import logging
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Optional, Tuple
 from openpyxl.cell import Cell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
 
 logger = logging.getLogger(__name__)
 
+# Style properties every cell style is expected to carry; checked on each apply()
+_EXPECTED_PROPS = ('alignment', 'format', 'font_name', 'font_size')
+_REQUIRED_FONT_PROPS = ('font_name', 'font_size')
+
+
+# openpyxl style objects are immutable values once assigned (the cell keeps an index into the
+# workbook's style tables), so one instance per distinct set of properties is shared by every cell.
+@lru_cache(maxsize=256)
+def _font_for(items: Tuple[Tuple[str, Any], ...]) -> Font:
+    return Font(**dict(items))
+
+
+@lru_cache(maxsize=256)
+def _alignment_for(items: Tuple[Tuple[str, Any], ...]) -> Alignment:
+    return Alignment(**dict(items))
+
+
+@lru_cache(maxsize=32)
+def _fill_for(fill_color: str) -> PatternFill:
+    return PatternFill(start_color=fill_color, end_color=fill_color, fill_type='solid')
+
+
+@lru_cache(maxsize=32)
+def _border_for(border_style_name: str, openpyxl_style: str) -> Border:
+    side = Side(style=openpyxl_style, color='000000')
+    
+    # Special case: no_bottom border (for static content rows)
+    if border_style_name == 'no_bottom':
+        return Border(
+            left=side,
+            right=side,
+            top=side,
+            bottom=Side(style=None)  # No bottom border
+        )
+    # Special case: sides_only border (for col_static column)
+    if border_style_name == 'sides_only':
+        return Border(
+            left=side,
+            right=side,
+            top=Side(style=None),     # No top border
+            bottom=Side(style=None)   # No bottom border
+        )
+    # Apply to all sides (standard behavior)
+    return Border(
+        left=side,
+        right=side,
+        top=side,
+        bottom=side
+    )
+
 
 class CellStyler:
     """
@@ -51,12 +102,13 @@ class CellStyler:
             logger.warning(f"warning!!  Cell {cell.coordinate}: NO style dictionary provided!")
             return
         
-        # Validate expected style properties
-        expected_props = ['alignment', 'format', 'font_name', 'font_size']
-        missing_props = [prop for prop in expected_props if prop not in style or style[prop] is None]
-        if missing_props:
-            logger.warning(f"warning!!  Cell {cell.coordinate}: Missing style properties: {missing_props}")
-            logger.warning(f"   → Style dict keys: {list(style.keys())}")
+        # Validate expected style properties (the list of missing ones is only built when one is missing)
+        for prop in _EXPECTED_PROPS:
+            if style.get(prop) is None:
+                missing_props = [p for p in _EXPECTED_PROPS if style.get(p) is None]
+                logger.warning(f"warning!!  Cell {cell.coordinate}: Missing style properties: {missing_props}")
+                logger.warning(f"   → Style dict keys: {list(style.keys())}")
+                break
         
         # Apply font properties (bold, italic, size, name)
         self._apply_font(cell, style)
@@ -73,15 +125,38 @@ class CellStyler:
         # Apply number format
         self._apply_format(cell, style)
     
+    def applied_style_fields(self, style: Dict[str, Any]) -> Tuple[str, ...]:
+        """
+        Names of the cell StyleArray id fields that apply() sets for this style.
+        
+        Mirrors the guards in the _apply_* helpers: anything the style dict omits
+        (e.g. no fill_color) is left untouched on the cell, as are protection and
+        the other StyleArray fields. Any change to those guards must be made here
+        too (tests/styling/test_cell_styler.py compares both for each style shape).
+        
+        Args:
+            style: Style dictionary from StyleRegistry
+        """
+        fields = []
+        if style.get('font_name') and style.get('font_size'):
+            fields.append('fontId')
+        if style.get('alignment'):
+            fields.append('alignmentId')
+        if style.get('fill_color'):
+            fields.append('fillId')
+        if style.get('border_style'):
+            fields.append('borderId')
+        if style.get('format'):
+            fields.append('numFmtId')
+        return tuple(fields)
+    
     def _apply_font(self, cell: Cell, style: Dict[str, Any]):
         """Apply font properties to cell."""
         font_kwargs = {}
         
         # Check for required font properties
-        required_font_props = ['font_name', 'font_size']
-        missing_font_props = [prop for prop in required_font_props if not style.get(prop)]
-        
-        if missing_font_props:
+        if not (style.get('font_name') and style.get('font_size')):
+            missing_font_props = [prop for prop in _REQUIRED_FONT_PROPS if not style.get(prop)]
             logger.warning(f"warning!!  Cell {cell.coordinate}: Missing required font properties: {missing_font_props}")
             logger.warning(f"   → Available style keys: {list(style.keys())}")
             return
@@ -99,7 +174,7 @@ class CellStyler:
             font_kwargs['name'] = style['font_name']
         
         if font_kwargs:
-            cell.font = Font(**font_kwargs)
+            cell.font = _font_for(tuple(font_kwargs.items()))
     
     def _apply_alignment(self, cell: Cell, style: Dict[str, Any]):
         """Apply alignment properties to cell."""
@@ -127,7 +202,11 @@ class CellStyler:
             alignment_kwargs['wrap_text'] = style['wrap_text']
         
         if alignment_kwargs:
-            cell.alignment = Alignment(**alignment_kwargs)
+            try:
+                cell.alignment = _alignment_for(tuple(sorted(alignment_kwargs.items())))
+            except TypeError:
+                # Unhashable alignment values cannot be cached
+                cell.alignment = Alignment(**alignment_kwargs)
     
     def _apply_fill(self, cell: Cell, style: Dict[str, Any]):
         """Apply fill color to cell."""
@@ -137,11 +216,7 @@ class CellStyler:
             if fill_color.startswith('#'):
                 fill_color = fill_color[1:]
             
-            cell.fill = PatternFill(
-                start_color=fill_color,
-                end_color=fill_color,
-                fill_type='solid'
-            )
+            cell.fill = _fill_for(fill_color)
     
     def _apply_borders(self, cell: Cell, style: Dict[str, Any]):
         """Apply border style to cell."""
@@ -150,34 +225,7 @@ class CellStyler:
         if border_style_name:
             # Map style name to openpyxl border style
             openpyxl_style = self.BORDER_STYLES.get(border_style_name, 'thin')
-            
-            # Create border sides
-            side = Side(style=openpyxl_style, color='000000')
-            
-            # Special case: no_bottom border (for static content rows)
-            if border_style_name == 'no_bottom':
-                cell.border = Border(
-                    left=side,
-                    right=side,
-                    top=side,
-                    bottom=Side(style=None)  # No bottom border
-                )
-            # Special case: sides_only border (for col_static column)
-            elif border_style_name == 'sides_only':
-                cell.border = Border(
-                    left=side,
-                    right=side,
-                    top=Side(style=None),     # No top border
-                    bottom=Side(style=None)   # No bottom border
-                )
-            else:
-                # Apply to all sides (standard behavior)
-                cell.border = Border(
-                    left=side,
-                    right=side,
-                    top=side,
-                    bottom=side
-                )
+            cell.border = _border_for(border_style_name, openpyxl_style)
         # Note: If border_style not in style dict, no borders are applied
         # This is expected behavior - borders are optional styling
     
@@ -204,6 +252,20 @@ class CellStyler:
         if height:
             worksheet.row_dimensions[row_num].height = height
     
+    def apply_row_heights(self, worksheet, row_nums: Iterable[int], height: Optional[int]):
+        """
+        Apply the same row height to several rows.
+        
+        Args:
+            worksheet: openpyxl Worksheet
+            row_nums: Row numbers (1-indexed)
+            height: Height in points (None = default)
+        """
+        if height:
+            row_dimensions = worksheet.row_dimensions
+            for row_num in row_nums:
+                row_dimensions[row_num].height = height
+    
     def apply_column_width(self, worksheet, col_letter: str, width: Optional[int]):
         """
         Apply column width to a specific column.
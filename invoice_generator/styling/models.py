@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Union
+from typing import Any, Optional, Dict, Union
 
 class FontModel(BaseModel):
     name: Optional[str] = None
@@ -36,6 +36,35 @@ class StylingConfigModel(BaseModel):
     class Config:
         populate_by_name = True
 
+# Validated models keyed by the frozen content of the styling dict they were built from
+_STYLING_MODEL_CACHE: Dict[Any, StylingConfigModel] = {}
+_STYLING_MODEL_CACHE_MAX = 32
+
+def _freeze(value: Any) -> Any:
+    """Recursively converts dicts/lists into hashable tuples for use as a cache key."""
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def make_styling_config_model(styling_config: Dict[str, Any]) -> StylingConfigModel:
+    """
+    Builds a StylingConfigModel from a styling dict, reusing the model already validated
+    for an equal dict (the same styling is shared by every table and sheet of a config).
+    """
+    try:
+        key = _freeze(styling_config)
+        model = _STYLING_MODEL_CACHE.get(key)
+    except TypeError:  # Unhashable content, validate directly
+        return StylingConfigModel(**styling_config)
+    if model is None:
+        model = StylingConfigModel(**styling_config)
+        if len(_STYLING_MODEL_CACHE) >= _STYLING_MODEL_CACHE_MAX:
+            _STYLING_MODEL_CACHE.clear()
+        _STYLING_MODEL_CACHE[key] = model
+    return model
+
 class FooterData(BaseModel):
     """
     Data object passed from DataTableBuilder to FooterBuilder.
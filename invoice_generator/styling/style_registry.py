@@ -172,9 +172,10 @@ class StyleRegistry:
         # 1. Get column base style (WHAT: format, alignment)
         if col_id in self.columns:
             col_style = self.columns[col_id].to_dict()
-            logger.debug(f"Column '{col_id}' style dict: {col_style}")
+            # Called for every styled cell: let logging format the dicts only when DEBUG is on
+            logger.debug("Column '%s' style dict: %s", col_id, col_style)
             merged_style.update({k: v for k, v in col_style.items() if v is not None})
-            logger.debug(f"After column merge: {merged_style}")
+            logger.debug("After column merge: %s", merged_style)
         else:
             logger.warning(f"❌ Column '{col_id}' not found in StyleRegistry!")
             logger.warning(f"   Available columns: {list(self.columns.keys())}")
@@ -197,19 +198,20 @@ class StyleRegistry:
             merged_style.update(overrides)
         
         # 4. STRICT VALIDATION: Verify all required properties exist
-        required_props = {
-            'alignment': f"Add 'alignment' to styling_bundle.{self.sheet_config.get('sheet_name', 'Sheet')}.columns.{col_id}",
-            'format': f"Add 'format' to styling_bundle.{self.sheet_config.get('sheet_name', 'Sheet')}.columns.{col_id}",
-            'font_name': f"Add 'font_name' to styling_bundle.{self.sheet_config.get('sheet_name', 'Sheet')}.row_contexts.{context}",
-            'font_size': f"Add 'font_size' to styling_bundle.{self.sheet_config.get('sheet_name', 'Sheet')}.row_contexts.{context}"
-        }
+        # (property -> config section it belongs to; the fix-it hint is only built when one is missing)
+        required_props = (
+            ('alignment', f"columns.{col_id}"),
+            ('format', f"columns.{col_id}"),
+            ('font_name', f"row_contexts.{context}"),
+            ('font_size', f"row_contexts.{context}"),
+        )
         
         missing_props = []
-        for prop, instruction in required_props.items():
+        for prop, section in required_props:
             if prop not in merged_style or merged_style[prop] is None:
                 missing_props.append(prop)
                 logger.warning(f"❌ StyleRegistry.get_style(col_id='{col_id}', context='{context}'): Missing required '{prop}'")
-                logger.warning(f"   → {instruction}")
+                logger.warning(f"   → Add '{prop}' to styling_bundle.{self.sheet_config.get('sheet_name', 'Sheet')}.{section}")
         
         if missing_props:
             logger.error(f"BROKEN INCOMPLETE STYLE: col_id='{col_id}', context='{context}' - missing {missing_props}")
@@ -0,0 +1,23 @@
+"""
+Formula Utilities
+
+Helpers for building Excel formula strings, shared by the builders that write
+per-row and footer formulas.
+"""
+
+from openpyxl.utils import get_column_letter
+
+# Column letters for indices 1..1023, looked up as COL_LETTERS[col_idx - 1]
+COL_LETTERS = tuple(get_column_letter(i) for i in range(1, 1024))
+
+
+def column_letter(col_idx: int) -> str:
+    """
+    Returns the column letter for a 1-based column index.
+    
+    Indexes the precomputed COL_LETTERS table and only calls
+    get_column_letter() for columns beyond it.
+    """
+    if 0 < col_idx <= len(COL_LETTERS):
+        return COL_LETTERS[col_idx - 1]
+    return get_column_letter(col_idx)
@@ -6,7 +6,8 @@ handling common issues like whitespace, string representations, and negative num
 """
 
 import logging
-from typing import Any, Optional, Union
+from decimal import Decimal, InvalidOperation
+from typing import Any, Iterable, Optional, Union
 
 logger = logging.getLogger(__name__)
 
@@ -90,3 +91,66 @@ def safe_int_convert(value: Any, default: int = 0) -> int:
             pass
             
     return default
+
+def sum_pallet_counts(values: Optional[Iterable[Any]]) -> int:
+    """
+    Sums a sequence of pallet counts, treating unparseable entries as 0.
+    
+    Pallet counts are usually plain integers, so the builtin sum() is used
+    directly when every entry is already an int. Int/float input is truncated
+    with int() in one pass; only input containing strings or None falls back
+    to safe_int_convert() per element.
+    
+    Args:
+        values: Pallet count entries (ints, floats, numeric strings, None).
+        
+    Returns:
+        The total pallet count as an integer.
+    """
+    if not values:
+        return 0
+    
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    
+    if all(type(v) is int for v in values):
+        return sum(values)
+    
+    # Plain numbers need none of the string handling; int() truncates floats like safe_int_convert()
+    if all(type(v) is int or type(v) is float for v in values):
+        return sum(map(int, values))
+    
+    return sum(map(safe_int_convert, values))
+
+def sum_decimal_values(values: Optional[Iterable[Any]]) -> Decimal:
+    """
+    Sums a sequence of weights exactly as Decimals, skipping unparseable entries.
+    
+    Every entry is converted via str() so floats keep their printed value.
+    The whole sequence is summed under a single try; only when some entry
+    fails to convert does it fall back to a per-element loop that skips it.
+    
+    Args:
+        values: Weight entries (ints, floats, numeric strings, None).
+        
+    Returns:
+        The total as a Decimal (Decimal('0') for empty input).
+    """
+    if not values:
+        return Decimal('0')
+    
+    if not isinstance(values, (list, tuple)):
+        values = list(values)
+    
+    try:
+        return sum(map(Decimal, map(str, values)), Decimal('0'))
+    except (InvalidOperation, TypeError, ValueError):
+        pass
+    
+    total = Decimal('0')
+    for value in values:
+        try:
+            total += Decimal(str(value))
+        except (InvalidOperation, TypeError, ValueError):
+            continue
+    return total
@@ -1,11 +1,10 @@
 import sys
-import traceback
 import logging
 from numpy import rint
 import openpyxl
-import traceback
 from openpyxl.worksheet.worksheet import Worksheet
 from openpyxl.styles import Alignment
+from openpyxl.worksheet.merge import MergedCellRange
 from openpyxl.utils import range_boundaries, get_column_letter, column_index_from_string
 # from openpyxl.worksheet.dimensions import RowDimension # Not strictly needed for access
 from typing import Dict, List, Optional, Tuple, Any
@@ -118,8 +117,7 @@ def find_and_restore_merges_heuristic(workbook: openpyxl.Workbook,
     try:
         search_min_col, search_min_row, search_max_col, search_max_row = range_boundaries(search_range_str)
     except TypeError as te:
-        logger.error(f"Error processing search range '{search_range_str}'. Check openpyxl version compatibility or range format. Internal error: {te}")
-        traceback.print_exc()
+        logger.exception(f"Error processing search range '{search_range_str}'. Check openpyxl version compatibility or range format. Internal error: {te}")
         return
     except Exception as e:
         logger.error(f"Invalid search range string '{search_range_str}'. Cannot proceed with restoration. Error: {e}")
@@ -257,37 +255,60 @@ def merge_vertical_cells_in_range(worksheet: Worksheet, scan_col: int, start_row
         start_row: The 1-based starting row index.
         end_row: The 1-based ending row index.
     """
-    if not all(isinstance(i, int) and i > 0 for i in [scan_col, start_row, end_row]) or start_row >= end_row:
-        return
+    merge_vertical_cells_in_columns(worksheet, [scan_col], start_row, end_row)
 
-    # First pass: Check if ALL values in the range are identical
-    first_cell = worksheet.cell(row=start_row, column=scan_col)
-    first_value = first_cell.value
-    
-    # Skip if first value is None/empty
-    if first_value is None:
-        return
+
+def merge_vertical_cells_in_columns(worksheet: Worksheet, scan_cols: List[int], start_row: int, end_row: int) -> List[int]:
+    """
+    All-or-nothing vertical merge (see merge_vertical_cells_in_range) for several columns at once.
     
-    # Check all remaining cells in range
+    Rows are scanned once for all columns; a column drops out as soon as one of its
+    values differs from its first row, and the scan stops early when none are left.
+
+    Args:
+        worksheet: The openpyxl Worksheet object.
+        scan_cols: The 1-based column indices to scan and merge.
+        start_row: The 1-based starting row index.
+        end_row: The 1-based ending row index.
+
+    Returns:
+        The column indices that were merged.
+    """
+    if not all(isinstance(i, int) and i > 0 for i in [start_row, end_row]) or start_row >= end_row:
+        return []
+
+    # First pass: Check if ALL values in the range are identical (skip columns whose first value is None/empty)
+    first_values = {}
+    for scan_col in dict.fromkeys(scan_cols):
+        if not isinstance(scan_col, int) or scan_col <= 0:
+            continue
+        first_value = worksheet.cell(row=start_row, column=scan_col).value
+        if first_value is not None:
+            first_values[scan_col] = first_value
+
     for row_idx in range(start_row + 1, end_row + 1):
-        cell = worksheet.cell(row=row_idx, column=scan_col)
-        if cell.value != first_value:
-            # Found a different value - don't merge at all
-            return
-    
+        if not first_values:
+            return []
+        for scan_col in list(first_values):
+            if worksheet.cell(row=row_idx, column=scan_col).value != first_values[scan_col]:
+                # Found a different value - don't merge this column at all
+                del first_values[scan_col]
+
+    if not first_values:
+        return []
+
     # All values are identical - merge the entire range
     try:
-        worksheet.merge_cells(
-            start_row=start_row,
-            start_column=scan_col,
-            end_row=end_row,
-            end_column=scan_col
-        )
+        apply_merge_ranges(worksheet, [(start_row, scan_col, end_row, scan_col) for scan_col in first_values])
+    except Exception as e:
+        logger.warning(f"  Failed to merge columns {list(first_values)} rows {start_row}-{end_row}: {e}")
+        return []
+
+    for scan_col, first_value in first_values.items():
         # Apply center alignment to the merged cell
-        first_cell.alignment = center_alignment
+        worksheet.cell(row=start_row, column=scan_col).alignment = center_alignment
         logger.debug(f"  Merged column {scan_col} rows {start_row}-{end_row} (all values = '{first_value}')")
-    except Exception as e:
-        logger.warning(f"  Failed to merge column {scan_col} rows {start_row}-{end_row}: {e}")
+    return list(first_values)
 
 
 def apply_horizontal_merge_by_id(
@@ -357,4 +378,40 @@ def apply_horizontal_merge_by_id(
             logger.debug(f"Merged row {row_num}, col_id '{col_id}' (cols {start_col_idx}-{end_col_idx})")
             
         except Exception as e:
-            logger.error(f"Error merging col_id '{col_id}' on row {row_num}: {e}")
\ No newline at end of file
+            logger.error(f"Error merging col_id '{col_id}' on row {row_num}: {e}")
+
+def apply_merge_ranges(worksheet: Worksheet, merge_ranges: List[Tuple[int, int, int, int]]) -> int:
+    """
+    Merges a batch of builder-generated cell ranges in one pass.
+    
+    worksheet.merge_cells() checks every new range against all existing merges
+    on the sheet before adding it. Rows written by the builders are new and
+    unmerged, so this registers the MergedCellRange objects directly and only
+    de-duplicates within the batch. Single-cell ranges are registered like any
+    other, as merge_cells() does. Cell cleanup and border formatting are the
+    same as merge_cells().
+    
+    Only use this for rows the builders have just written. Template restores
+    write onto rows that may already carry merges and must go through
+    worksheet.merge_cells(), which skips ranges contained in an existing merge.
+    
+    Args:
+        worksheet: The openpyxl Worksheet object.
+        merge_ranges: (start_row, start_col, end_row, end_col) tuples, 1-based.
+        
+    Returns:
+        Number of ranges merged.
+    """
+    ranges = worksheet.merged_cells.ranges
+    seen = set()
+    merged = 0
+    for start_row, start_col, end_row, end_col in merge_ranges:
+        if (start_row, start_col, end_row, end_col) in seen:
+            continue
+        seen.add((start_row, start_col, end_row, end_col))
+        coord = f"{get_column_letter(start_col)}{start_row}:{get_column_letter(end_col)}{end_row}"
+        mcr = MergedCellRange(worksheet, coord)
+        ranges.add(mcr)
+        worksheet._clean_merge_range(mcr)
+        merged += 1
+    return merged
@@ -110,7 +110,16 @@ class TestBundleAccessor(unittest.TestCase):
         """Test sheet_styling_config converts dict to StylingConfigModel."""
         styling = self.accessor.sheet_styling_config
         self.assertIsInstance(styling, StylingConfigModel)
-    
+
+    def test_sheet_styling_config_property_reuses_model_for_equal_dict(self):
+        """Test equal styling dicts share one validated StylingConfigModel."""
+        accessor = BundleAccessor(
+            worksheet=self.worksheet,
+            style_config={'styling_config': dict(self.style_config['styling_config'])},
+            context_config=self.context_config
+        )
+        self.assertIs(accessor.sheet_styling_config, self.accessor.sheet_styling_config)
+
     def test_sheet_styling_config_property_already_model(self):
         """Test sheet_styling_config returns existing StylingConfigModel."""
         model = StylingConfigModel(**self.style_config['styling_config'])
@@ -0,0 +1,84 @@
+"""
+Tests for DataTableBuilderStyler data row styling.
+
+Every data row of a column gets the column's 'data' style; rows after the
+first reuse the style ids registered for the first row.
+"""
+import unittest
+from copy import copy
+from openpyxl import Workbook
+from openpyxl.styles import PatternFill, Protection
+
+from invoice_generator.builders.data_table_builder import DataTableBuilderStyler
+
+
+class TestDataTableBuilderRowStyles(unittest.TestCase):
+    """Data rows 2..N are styled exactly like the first data row."""
+
+    def setUp(self):
+        self.workbook = Workbook()
+        self.worksheet = self.workbook.active
+        self.header_info = {
+            'second_row_index': 1,
+            'num_columns': 3,
+            'column_id_map': {'col_static': 1, 'col_po': 2, 'col_amount': 3},
+        }
+        self.styling_config = {
+            'columns': {
+                'col_static': {'format': '@', 'alignment': 'left'},
+                'col_po': {'format': '@', 'alignment': 'center'},
+                'col_amount': {'format': '#,##0.00', 'alignment': 'right'},
+            },
+            'row_contexts': {
+                'data': {'font_name': 'Times New Roman', 'font_size': 12, 'bold': False, 'border_style': 'thin'},
+            },
+        }
+        self.data_rows = [{1: 'LEATHER', 2: f'PO-{i}', 3: i * 1.5} for i in range(1, 6)]
+
+    def _build(self):
+        builder = DataTableBuilderStyler(
+            worksheet=self.worksheet,
+            header_info=self.header_info,
+            resolved_data={'data_rows': self.data_rows},
+            sheet_styling_config=self.styling_config,
+        )
+        self.assertTrue(builder.build())
+
+    def test_later_rows_match_first_row_style(self):
+        self._build()
+        last_row = 1 + len(self.data_rows)
+        for col_idx in (1, 2, 3):
+            first = self.worksheet.cell(row=2, column=col_idx)
+            for row_idx in range(3, last_row + 1):
+                cell = self.worksheet.cell(row=row_idx, column=col_idx)
+                # copy() unwraps openpyxl's StyleProxy so the style values are compared
+                self.assertEqual(copy(cell.font), copy(first.font))
+                self.assertEqual(copy(cell.border), copy(first.border))
+                self.assertEqual(copy(cell.alignment), copy(first.alignment))
+                self.assertEqual(cell.number_format, first.number_format)
+
+    def test_col_static_keeps_side_only_borders(self):
+        self._build()
+        for row_idx in range(2, 2 + len(self.data_rows)):
+            border = self.worksheet.cell(row=row_idx, column=1).border
+            self.assertEqual((border.left.style, border.right.style), ('thin', 'thin'))
+            self.assertIsNone(border.top.style)
+            self.assertIsNone(border.bottom.style)
+        self.assertEqual(self.worksheet.cell(row=3, column=2).border.top.style, 'thin')
+
+    def test_attributes_outside_the_style_are_kept(self):
+        locked = Protection(locked=False)
+        fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+        target = self.worksheet.cell(row=4, column=2)
+        target.protection = locked
+        target.fill = fill
+
+        self._build()
+
+        self.assertEqual(copy(target.protection), locked)
+        self.assertEqual(copy(target.fill), fill)
+        self.assertEqual(copy(target.font), copy(self.worksheet.cell(row=2, column=2).font))
+
+
+if __name__ == '__main__':
+    unittest.main()
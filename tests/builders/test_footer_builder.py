@@ -0,0 +1,50 @@
+"""
+Tests for FooterBuilder weight summary add-on.
+"""
+import unittest
+from openpyxl import Workbook
+
+from invoice_generator.builders.footer_builder import FooterBuilder
+from invoice_generator.styling.models import FooterData
+
+
+class TestFooterBuilderWeightSummary(unittest.TestCase):
+    """Weight summary values always get the fixed weight number format."""
+
+    def setUp(self):
+        self.workbook = Workbook()
+        self.worksheet = self.workbook.active
+        self.header_info = {
+            'num_columns': 2,
+            'column_id_map': {'col_label': 1, 'col_weight': 2},
+        }
+        self.footer_data = FooterData(
+            footer_row_start_idx=5,
+            data_start_row=2,
+            data_end_row=4,
+            total_pallets=1,
+            weight_summary={'net': 1234.5, 'gross': 1500},
+        )
+
+    def test_weight_values_keep_number_format_without_style_registry(self):
+        """Test N.W/G.W values are formatted even when no StyleRegistry is configured."""
+        builder = FooterBuilder(
+            worksheet=self.worksheet,
+            footer_data=self.footer_data,
+            style_config={},
+            context_config={'header_info': self.header_info},
+            data_config={},
+        )
+        next_row = builder._build_weight_summary_addon(
+            5, {'label_col_id': 'col_label', 'value_col_id': 'col_weight'}
+        )
+
+        self.assertEqual(next_row, 7)
+        self.assertEqual(self.worksheet.cell(row=5, column=2).value, 1234.5)
+        self.assertEqual(self.worksheet.cell(row=5, column=2).number_format, '#,##0.00')
+        self.assertEqual(self.worksheet.cell(row=6, column=2).value, 1500.0)
+        self.assertEqual(self.worksheet.cell(row=6, column=2).number_format, '#,##0.00')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -428,6 +428,52 @@ class TestBuilderConfigResolver(unittest.TestCase):
         # header_row is 21, so second_row_index should be 22
         self.assertEqual(header_info['second_row_index'], 22)
     
+    def test_construct_header_info_reuses_column_maps_when_header_row_moves(self):
+        """Test _construct_header_info parses columns once but follows header_row changes."""
+        layout_config = self.raw_config['layout_bundle']['Invoice']
+        first = self.resolver._construct_header_info(layout_config)
+        layout_config['structure']['header_row'] = 40
+        second = self.resolver._construct_header_info(layout_config)
+
+        self.assertIs(first['column_id_map'], second['column_id_map'])
+        self.assertEqual(first['second_row_index'], 22)
+        self.assertEqual(second['second_row_index'], 41)
+
+    def test_construct_header_info_does_not_share_column_maps_between_resolvers(self):
+        """Test each resolver builds its own column maps for the same columns list."""
+        layout_config = self.raw_config['layout_bundle']['Invoice']
+        other_resolver = BuilderConfigResolver(
+            config_loader=self.config_loader,
+            sheet_name='Invoice',
+            worksheet=self.worksheet,
+            args=self.args,
+            invoice_data=self.invoice_data,
+            pallets=31
+        )
+        first = self.resolver._construct_header_info(layout_config)
+        second = other_resolver._construct_header_info(layout_config)
+
+        self.assertIsNot(first['column_id_map'], second['column_id_map'])
+        self.assertEqual(first['column_id_map'], second['column_id_map'])
+
+    def test_get_table_data_resolver_parses_mapping_rules_once_per_resolver(self):
+        """Test table adapters of one resolver share parsed rules, other resolvers parse their own."""
+        first = self.resolver.get_table_data_resolver(table_key='1')._parse_mapping_rules()
+        second = self.resolver.get_table_data_resolver(table_key='2')._parse_mapping_rules()
+        other_resolver = BuilderConfigResolver(
+            config_loader=self.config_loader,
+            sheet_name='Invoice',
+            worksheet=self.worksheet,
+            args=self.args,
+            invoice_data=self.invoice_data,
+            pallets=31
+        )
+        other = other_resolver.get_table_data_resolver(table_key='1')._parse_mapping_rules()
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(first, other)
+
     def test_construct_header_info_includes_num_columns(self):
         """Test _construct_header_info includes correct number of columns."""
         layout_config = self.raw_config['layout_bundle']['Invoice']
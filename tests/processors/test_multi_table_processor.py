@@ -0,0 +1,15 @@
+import unittest
+from invoice_generator.processors.multi_table_processor import _table_sort_key
+
+class TestTableSortKey(unittest.TestCase):
+
+    def test_orders_numeric_string_keys_numerically(self):
+        keys = ['10', '2', '1']
+        self.assertEqual(sorted(keys, key=_table_sort_key), ['1', '2', '10'])
+
+    def test_mixed_keys_keep_non_numeric_last_in_original_order(self):
+        keys = ['summary', 3, '1', 'extra', '2']
+        self.assertEqual(sorted(keys, key=_table_sort_key), ['1', '2', 3, 'summary', 'extra'])
+
+if __name__ == '__main__':
+    unittest.main()
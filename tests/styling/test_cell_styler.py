@@ -0,0 +1,71 @@
+"""
+Test CellStyler.applied_style_fields against what apply() actually sets
+"""
+
+import pytest
+from openpyxl import Workbook
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, Protection
+from openpyxl.styles.cell_style import StyleArray
+
+from invoice_generator.styling.cell_styler import CellStyler
+
+
+# Every id field of openpyxl's internal StyleArray (cell._style)
+STYLE_ARRAY_FIELDS = (
+    'fontId', 'fillId', 'borderId', 'numFmtId', 'protectionId',
+    'alignmentId', 'pivotButton', 'quotePrefix', 'xfId',
+)
+
+FULL_STYLE = {
+    'font_name': 'Times New Roman',
+    'font_size': 12,
+    'bold': True,
+    'alignment': 'center',
+    'fill_color': '#CCCCCC',
+    'border_style': 'thin',
+    'format': '#,##0.00',
+}
+
+
+def _without(*keys):
+    return {k: v for k, v in FULL_STYLE.items() if k not in keys}
+
+
+STYLE_SHAPES = {
+    'full': FULL_STYLE,
+    'no_fill': _without('fill_color'),
+    'no_border': _without('border_style'),
+    'sides_only_border': {**FULL_STYLE, 'border_style': 'sides_only'},
+    'no_alignment': _without('alignment'),
+    'alignment_dict': {**FULL_STYLE, 'alignment': {'horizontal': 'left', 'wrap_text': True}},
+    'no_font_size': _without('font_size'),
+    'no_font_name': _without('font_name'),
+    'no_format': _without('format'),
+    'general_format': {**FULL_STYLE, 'format': 'General'},
+    'format_only': {'format': '@'},
+}
+
+
+def _seeded_cell():
+    """A cell whose every style id differs from anything apply() can produce."""
+    cell = Workbook().active['B2']
+    cell.font = Font(name='Seed', size=7)
+    cell.alignment = Alignment(horizontal='fill', vertical='top')
+    cell.fill = PatternFill(start_color='123456', end_color='123456', fill_type='solid')
+    cell.border = Border(diagonal=Side(style='dashDot'))
+    cell.number_format = '0.000%'
+    cell.protection = Protection(locked=False)
+    return cell
+
+
+@pytest.mark.parametrize('style', STYLE_SHAPES.values(), ids=list(STYLE_SHAPES))
+def test_applied_style_fields_match_apply(style):
+    """applied_style_fields() names exactly the StyleArray fields apply() changes."""
+    styler = CellStyler()
+    cell = _seeded_cell()
+    before = StyleArray(cell._style)
+
+    styler.apply(cell, style)
+
+    changed = {field for field in STYLE_ARRAY_FIELDS if getattr(cell._style, field) != getattr(before, field)}
+    assert changed == set(styler.applied_style_fields(style))
@@ -0,0 +1,18 @@
+import unittest
+from decimal import Decimal
+from invoice_generator.utils.math_utils import sum_decimal_values
+
+class TestSumDecimalValues(unittest.TestCase):
+
+    def test_sums_numbers_and_numeric_strings_exactly(self):
+        self.assertEqual(sum_decimal_values([1.1, '2.2', 3]), Decimal('6.3'))
+
+    def test_skips_unparseable_entries(self):
+        self.assertEqual(sum_decimal_values(['1.5', None, 'n/a', '', 2]), Decimal('3.5'))
+
+    def test_empty_input_is_zero(self):
+        self.assertEqual(sum_decimal_values([]), Decimal('0'))
+        self.assertEqual(sum_decimal_values(None), Decimal('0'))
+
+if __name__ == '__main__':
+    unittest.main()
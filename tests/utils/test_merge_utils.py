@@ -0,0 +1,43 @@
+import unittest
+from openpyxl import Workbook
+from openpyxl.cell.cell import MergedCell
+from invoice_generator.utils.merge_utils import apply_merge_ranges, merge_vertical_cells_in_columns
+
+class TestApplyMergeRanges(unittest.TestCase):
+
+    def setUp(self):
+        self.ws = Workbook().active
+
+    def test_merges_batch(self):
+        self.ws.cell(row=5, column=2, value="LEATHER")
+        merged = apply_merge_ranges(self.ws, [(5, 2, 5, 4), (6, 2, 6, 4)])
+
+        self.assertEqual(merged, 2)
+        coords = sorted(r.coord for r in self.ws.merged_cells.ranges)
+        self.assertEqual(coords, ["B5:D5", "B6:D6"])
+        self.assertEqual(self.ws.cell(row=5, column=2).value, "LEATHER")
+        self.assertIsInstance(self.ws.cell(row=5, column=3), MergedCell)
+
+    def test_skips_duplicates_and_keeps_single_cells(self):
+        merged = apply_merge_ranges(self.ws, [(1, 1, 1, 2), (1, 1, 1, 2), (2, 3, 2, 3)])
+
+        self.assertEqual(merged, 2)
+        self.assertEqual(sorted(r.coord for r in self.ws.merged_cells.ranges), ["A1:B1", "C2"])
+
+class TestMergeVerticalCellsInColumns(unittest.TestCase):
+
+    def test_merges_only_uniform_columns(self):
+        ws = Workbook().active
+        for row in range(2, 5):
+            ws.cell(row=row, column=1, value="LEATHER")
+            ws.cell(row=row, column=2, value=row)
+        ws.cell(row=2, column=3, value=None)
+
+        merged = merge_vertical_cells_in_columns(ws, [1, 2, 3], 2, 4)
+
+        self.assertEqual(merged, [1])
+        self.assertEqual([r.coord for r in ws.merged_cells.ranges], ["A2:A4"])
+        self.assertEqual(ws.cell(row=2, column=1).alignment.horizontal, "center")
+
+if __name__ == '__main__':
+    unittest.main()